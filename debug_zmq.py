@@ -161,7 +161,7 @@ class ZMQDebugger:
                 for name, socket in self.sockets.items():
                     if socket in socks:
                         try:
-                            msg = socket.recv_string(zmq.NOBLOCK)
+                            msg = socket.recv(zmq.NOBLOCK)  # LIDAR frames are binary
                             self.process_message(name, msg)
                         except zmq.Again:
                             continue
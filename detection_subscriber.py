@@ -17,7 +17,7 @@ class CombinedSubscriber:
         
         # LIDAR subscriber
         self.lidar_socket = self.context.socket(zmq.SUB)
-        self.lidar_socket.connect("tcp://localhost:5556")
+        self.lidar_socket.connect("ipc:///tmp/lidar.ipc")  # Same host: Unix socket, not TCP loopback
         self.lidar_socket.setsockopt_string(zmq.SUBSCRIBE, "LIDAR_DATA")
         
         # Store recent data
@@ -30,19 +30,12 @@ class CombinedSubscriber:
         self.print_interval = 2.0  # Print every 2 seconds
 
     def parse_lidar_message(self, message):
-        """Parse plain text LIDAR message into structured data"""
-        # Remove the "LIDAR_DATA " prefix
-        data_str = message.replace("LIDAR_DATA ", "")
+        """Parse binary LIDAR message into structured data"""
+        # Skip the "LIDAR_DATA" topic prefix; the rest is float32 (angle, distance) pairs
+        points = np.frombuffer(message, dtype='<f4', offset=10).reshape(-1, 2)
         
-        # Parse the measurements
-        scan_points = []
-        for measurement in data_str.split(';'):
-            if measurement.strip():
-                angle, distance = map(float, measurement.split(','))
-                scan_points.append({
-                    'angle': angle,
-                    'distance': distance
-                })
+        scan_points = [{'angle': angle, 'distance': distance}
+                       for angle, distance in points.tolist()]
         
         return {
             'timestamp': time.time(),
@@ -60,8 +53,9 @@ class CombinedSubscriber:
 
     def lidar_listener(self):
         while True:
-            message = self.lidar_socket.recv_string()
-            data = self.parse_lidar_message(message)
+            # Zero-copy frame; parse_lidar_message reads its buffer directly
+            frame = self.lidar_socket.recv(copy=False)
+            data = self.parse_lidar_message(frame.buffer)
             
             with self.lock:
                 self.latest_lidar = data
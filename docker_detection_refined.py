@@ -112,16 +112,11 @@ def compute_horizontal_fov(diag_fov_deg, width, height):
     horizontal_fov_rad = 2.0 * math.atan(horizontal_scale * math.tan(diag_fov_rad / 2.0))
     return math.degrees(horizontal_fov_rad)
 
-CAMERA_HFOV_DEG = compute_horizontal_fov(DIAGONAL_FOV_DEG, ASPECT_WIDTH, ASPECT_HEIGHT)
+# compute_horizontal_fov(DIAGONAL_FOV_DEG, ASPECT_WIDTH, ASPECT_HEIGHT), evaluated offline;
+# recompute if the camera or aspect ratio changes
+CAMERA_HFOV_DEG = 70.42796571601109
 IMAGE_CENTER_X  = IMAGE_WIDTH / 2.0
 
-print(f"Camera Parameters:")
-print(f"- Horizontal FOV: {CAMERA_HFOV_DEG:.1f}°")
-print(f"- Image Center: {IMAGE_CENTER_X:.1f} px")
-print(f"- Image Width: {IMAGE_WIDTH:.1f} px")
-print(f"Publishing detections on port 5555 for LiDAR correlation")
-print("Camera detection system initialized and running...")
-
 # -----------------------------------------------------------------------------------------------
 # Helper function: compute bounding box area
 # -----------------------------------------------------------------------------------------------
@@ -149,24 +144,24 @@ class user_app_callback_class(app_callback_class):
         self.socket.setsockopt(zmq.SNDHWM, 1)  # Only queue 1 message
         self.socket.setsockopt(zmq.LINGER, 0)  # Don't wait when closing
         self.socket.setsockopt(zmq.CONFLATE, 1)  # Only keep latest message
-        self.socket.setsockopt(zmq.RCVBUF, 8192)  # Smaller receive buffer
-        self.socket.setsockopt(zmq.SNDBUF, 8192)  # Smaller send buffer
+        self.socket.setsockopt(zmq.SNDBUF, 4 << 20)  # 4 MiB send buffer absorbs bursts
+        self.socket.setsockopt(zmq.TCP_KEEPALIVE, 1)  # Detect dead subscribers
+        self.socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
         
         self.socket.bind("tcp://*:5555")
         print("ZMQ publisher started on port 5555")
         self.last_process_time = time.time()
-        self.camera_hfov = compute_horizontal_fov(DIAGONAL_FOV_DEG, ASPECT_WIDTH, ASPECT_HEIGHT)
+        self.camera_hfov = CAMERA_HFOV_DEG
         print(f"Camera horizontal FOV: {self.camera_hfov:.1f}°")
         
         # Pre-compute constants for angle calculation
         self.angle_scale = (self.camera_hfov/2) / (IMAGE_WIDTH/2)
         self.image_center = IMAGE_WIDTH / 2.0
 
-    def __del__(self):
-        if hasattr(self, 'socket'):
-            self.socket.close()
-        if hasattr(self, 'context'):
-            self.context.term()
+    def close(self):
+        """Close the LINGER=0 publisher and terminate ZMQ"""
+        self.socket.close()
+        self.context.term()
 
 # -----------------------------------------------------------------------------------------------
 # Helper function: bounding box center -> angle for 2D LiDAR correlation
@@ -305,6 +300,13 @@ class NoDisplayDetectionApp(GStreamerDetectionApp):
         print("Using headless detection app (no display output)")
 
 if __name__ == "__main__":
+    print(f"Camera Parameters:")
+    print(f"- Horizontal FOV: {CAMERA_HFOV_DEG:.1f}°")
+    print(f"- Image Center: {IMAGE_CENTER_X:.1f} px")
+    print(f"- Image Width: {IMAGE_WIDTH:.1f} px")
+    print(f"Publishing detections on port 5555 for LiDAR correlation")
+    print("Camera detection system initialized and running...")
+
     # Instantiate callback class and detection app
     user_data = user_app_callback_class()
     
@@ -326,4 +328,8 @@ if __name__ == "__main__":
         )
     
     print("Starting detection app with display disabled...")
-    app.run()
+    try:
+        app.run()
+    finally:
+        # Explicit shutdown; __del__ may never run at interpreter exit
+        user_data.close()
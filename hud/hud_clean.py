@@ -7,6 +7,7 @@ import pygame
 import threading
 import os
 import json
+import struct
 from collections import defaultdict
 
 # ----------------------------
@@ -197,9 +198,9 @@ class LidarHUD:
 
         # Connect sockets
         try:
-            self.lidar_subscriber.connect("tcp://localhost:5556")  # LIDAR data
+            self.lidar_subscriber.connect("ipc:///tmp/lidar.ipc")  # LIDAR data over a Unix socket (same host)
             self.object_subscriber.connect("tcp://localhost:5557")  # Correlated objects
-            print("Connected to ZMQ ports 5556 and 5557")
+            print("Connected to LiDAR (ipc) and ZMQ port 5557")
         except zmq.error.ZMQError as e:
             print(f"Failed to connect ZMQ sockets: {e}")
             print("Make sure lidar_zmq_refined is running!")
@@ -503,14 +504,11 @@ class LidarHUD:
                 # Process LIDAR data with lower priority
                 if self.lidar_subscriber in socks:
                     try:
-                        msg = self.lidar_subscriber.recv_string(zmq.NOBLOCK)
-                        if msg.startswith("LIDAR_DATA"):
-                            data_str = msg[10:].strip()
-                            self.lidar_points = [
-                                (float(p.split(',')[0]), float(p.split(',')[1]))
-                                for p in data_str.split(';')
-                                if p and ',' in p
-                            ]
+                        # Zero-copy frame: unpack straight from libzmq's buffer
+                        msg = self.lidar_subscriber.recv(zmq.NOBLOCK, copy=False).buffer
+                        if msg[:10] == b"LIDAR_DATA":
+                            # Binary frame: topic + packed little-endian float32 (angle, dist) pairs
+                            self.lidar_points = list(struct.iter_unpack('<ff', msg[10:]))
                             self.update_lidar_map()
                             self.last_lidar_update = current_time
                     except Exception:
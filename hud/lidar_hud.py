@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 import sys
-import math
 import time
 import zmq
 import pygame
+import numpy as np
 import threading
 import os
 import json
-from collections import defaultdict
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from collections import defaultdict, deque
+
+# Numba is optional: without it the LiDAR projection stays on the NumPy path
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # ----------------------------
 # Display & Radar Config
@@ -24,6 +33,18 @@ MAX_RANGE_MM = 3000  # Keep at 3m for now
 # The radar circle occupies most of the screen height
 RADAR_RADIUS = min(SCREEN_HEIGHT//2 - 20, CENTER_Y + SCREEN_HEIGHT//3)  # Use available height
 
+# Millimetres -> screen pixels
+RADAR_SCALE = RADAR_RADIUS / MAX_RANGE_MM
+MIN_RANGE_MM = 100  # Filter only extremely close points (<10cm)
+
+# Pixel offsets written for each LiDAR point (a small plus-shaped dot)
+LIDAR_SPLAT = ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1))
+LIDAR_STAMP_DOTS = False  # Blit round alpha stamps instead of raw pixel splats
+
+# Topic prefix of the binary LiDAR frames published by lidar_zmq_refined
+LIDAR_TOPIC = b"LIDAR_DATA"
+LIDAR_TOPIC_LEN = len(LIDAR_TOPIC)
+
 # Colors: ARGB format, fully opaque (0xFF at the top bits)
 COLORS = {
     'background': 0xFF000000,   # black
@@ -52,15 +73,146 @@ BIKE_OBJECTS = {
     'parking meter': {'color': 0xFF888888, 'priority': 1}
 }
 
+def split_rgb(c):
+    """Convert a 0xAARRGGBB color into (R, G, B) for Pygame"""
+    return ((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF)
+
+# (R, G, B) tuples split once at import instead of on every draw
+RGB = {key: split_rgb(c) for key, c in COLORS.items()}
+for cfg in BIKE_OBJECTS.values():
+    cfg['rgb'] = split_rgb(cfg['color'])
+
 # Performance tuning constants
 OBJECT_PERSISTENCE = 2.0  # Increased to 2s - only used for stale object cleanup
-POLL_TIMEOUT = 10  # Keep at 10ms
+POLL_TIMEOUT = 10  # Keep at 10ms: also bounds how long a new LiDAR ring slot waits for pickup
+LIDAR_POLL_TIMEOUT = 33  # LiDAR worker: poll returns on arrival, this only paces stop checks
 MAX_FPS = 60  # Keep at 60 FPS
 ZMQ_HWM = 2  # Keep at 2
+LIDAR_ENDPOINT = "ipc:///tmp/lidar.ipc"  # Same host as the LiDAR publisher: Unix socket, not TCP loopback
+ZMQ_RCVBUF = 65536  # Cap the object socket's kernel TCP receive buffer (the hidden queue behind HWM/CONFLATE)
 ANGLE_BUCKET_SIZE = 5.0  # Keep at 5.0
 MAX_ANGLE_DIFF = 10.0  # Keep at 10.0
+MAX_DEBUG_LINES = 6  # Lines in the top-left debug overlay
+TRIG_STEPS_PER_DEG = 10  # Resolution of the cos/sin lookup tables (0.1°)
+TRIG_TABLE_SIZE = 360 * TRIG_STEPS_PER_DEG
+FADE_BANDS = 8  # Number of precomputed age-fade steps for object colors
+SMOOTHING_ALPHA = 0.3  # EMA weight of a new measurement (lower is smoother)
+TEXT_CACHE_SIZE = 256  # Max pre-rendered text surfaces kept around
+GRID_INTERVAL_MM = 500  # Distance between grid circles (0.5m)
+OBJECT_SLOTS = 64  # Fixed capacity of the tracked-object ring
+EXPIRY_INTERVAL = 1.0  # Seconds between stale-object sweeps
+HISTORY_CAPACITY = 256  # Rows of smoothing state (distinct object ids) kept
+LIDAR_MAX_POINTS = 2048  # Per-scan capacity of a shared-memory ring slot
+LIDAR_RING_SLOTS = 4  # Scans held in the shared-memory ring
+RING_HEADER_BYTES = LIDAR_RING_SLOTS * 2 * 8  # float64 (timestamp, n_points) per slot
+
+def recv_latest(socket):
+    """Drain every queued message from socket and return only the newest zmq.Frame (or None)"""
+    last = None
+    try:
+        while True:
+            # copy=False hands back the libzmq message itself; nothing is copied into Python
+            last = socket.recv(zmq.NOBLOCK, copy=False)
+    except zmq.Again:
+        pass
+    return last
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def project_points(angles, dists, offset, cos_tbl, sin_tbl, out_x, out_y):
+        """Range-filter and project polar points to screen pixels; returns the count written"""
+        n = 0
+        for i in range(angles.shape[0]):
+            d = dists[i]
+            if d < MIN_RANGE_MM or d > MAX_RANGE_MM:
+                continue
+            k = int(np.rint((offset - angles[i]) * TRIG_STEPS_PER_DEG)) % TRIG_TABLE_SIZE
+            r = d * RADAR_SCALE
+            x = int(CENTER_X + r * cos_tbl[k])
+            y = int(CENTER_Y + r * sin_tbl[k])
+            # Drop points whose splat would leave the screen
+            if x < 1 or x >= SCREEN_WIDTH - 1 or y < 1 or y >= SCREEN_HEIGHT - 1:
+                continue
+            out_x[n] = x
+            out_y[n] = y
+            n += 1
+        return n
+
+def ring_views(ring_buf, seq_buf):
+    """Map numpy views over the LiDAR ring: (header, points, sequence counter)"""
+    header = np.ndarray((LIDAR_RING_SLOTS, 2), dtype=np.float64, buffer=ring_buf)
+    points = np.ndarray((LIDAR_RING_SLOTS, 2, LIDAR_MAX_POINTS), dtype=np.float32,
+                        buffer=ring_buf, offset=RING_HEADER_BYTES)
+    seq = np.ndarray((1,), dtype=np.int64, buffer=seq_buf)
+    return header, points, seq
+
+def lidar_worker(ring_name, seq_name, stop):
+    """Child process: receive and parse LiDAR frames into the shared-memory ring"""
+    ring_shm = shared_memory.SharedMemory(name=ring_name)
+    seq_shm = shared_memory.SharedMemory(name=seq_name)
+    header, points, seq = ring_views(ring_shm.buf, seq_shm.buf)
+
+    context = zmq.Context()
+    socket = context.socket(zmq.SUB)
+    socket.setsockopt(zmq.RCVHWM, ZMQ_HWM)  # Receive high water mark
+    socket.setsockopt(zmq.LINGER, 0)  # Don't wait on close
+    socket.setsockopt(zmq.CONFLATE, 1)  # Only keep latest message
+    socket.setsockopt(zmq.RCVTIMEO, 0)  # Never block on receive
+    socket.setsockopt_string(zmq.SUBSCRIBE, "")
+    socket.connect(LIDAR_ENDPOINT)
+
+    while not stop.is_set():
+        try:
+            if not socket.poll(LIDAR_POLL_TIMEOUT):
+                continue
+            frame = recv_latest(socket)
+            if frame is None:
+                continue
+            buf = frame.buffer  # Zero-copy memoryview over the message
+            if buf[:LIDAR_TOPIC_LEN] != LIDAR_TOPIC:
+                continue
+            # Binary frame: topic + packed little-endian float32 (angle, dist) pairs
+            n = min((len(buf) - LIDAR_TOPIC_LEN) // 8, LIDAR_MAX_POINTS)
+            if n <= 0:
+                continue
+            flat = np.frombuffer(buf, dtype='<f4', offset=LIDAR_TOPIC_LEN, count=n * 2)
+
+            # Fill the slot after the one the reader may be copying, then publish it
+            slot = (int(seq[0]) + 1) % LIDAR_RING_SLOTS
+            points[slot, 0, :n] = flat[0::2]
+            points[slot, 1, :n] = flat[1::2]
+            header[slot] = (time.time(), n)
+            seq[0] += 1
+        except Exception as e:
+            print(f"Error in lidar_worker: {e}")
+
+    socket.close()
+    context.term()
+    del header, points, seq  # Drop buffer exports before closing the mappings
+    ring_shm.close()
+    seq_shm.close()
+
+class TrackedObject:
+    """A correlated object on the radar; instances are pooled and refilled in place"""
+    __slots__ = ('key', 'cls', 'confidence', 'angle_deg', 'distance_mm', 'area', 'timestamp', 'last_seen')
 
 class LidarHUD:
+    # Fixed attribute layout: slot loads instead of instance-dict lookups in the render loops
+    __slots__ = (
+        'screen', 'font', 'large_font', '_text_cache', '_grid_labels', '_angle_labels',
+        'COS', 'SIN', '_cos_tbl', '_sin_tbl', '_out_x', '_out_y', '_grid_surface', '_background', '_dirty', '_full_redraw',
+        '_lidar_px', '_lidar_stamp', '_obj_stamps', '_debug_panel', '_debug_counts',
+        'loaded_images', 'current_image', 'alpha_overlay',
+        'object_icons', 'faded_rgb', 'faded_unknown', 'faded_text',
+        'context', 'object_subscriber',
+        '_ring_shm', '_seq_shm', '_ring_header', '_ring_points', '_ring_seq',
+        '_lidar_stop', '_lidar_proc',
+        'lidar_scan', 'lidar_buckets', 'detected_objects', '_obj_records', '_obj_slots', '_obj_free', '_last_expiry',
+        'object_history', '_hist_arr', 'history_length', 'last_lidar_update', 'last_object_update',
+        'running', 'show_radar', 'show_debug', 'angle_offset', 'show_lidar',
+        'data_thread',
+    )
+
     def __init__(self):
         # Print current environment info
         print("Current environment:")
@@ -71,6 +223,9 @@ class LidarHUD:
         # Initialize SDL
         pygame.init()
         
+        # Set by _set_mode: SCALED displays present whole frames, so dirty rects buy nothing
+        self._full_redraw = False
+
         # If we're in X11, use that, otherwise try direct framebuffer
         if os.getenv('DISPLAY'):
             print("Using X11 mode")
@@ -78,8 +233,7 @@ class LidarHUD:
             screen = None
             try:
                 pygame.display.init()
-                screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 
-                                               pygame.FULLSCREEN | pygame.NOFRAME)
+                screen = self._set_mode(pygame.FULLSCREEN | pygame.NOFRAME)
             except pygame.error as e:
                 print(f"X11 fullscreen failed: {str(e)}")
                 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -94,8 +248,7 @@ class LidarHUD:
                 try:
                     pygame.display.quit()  # Reset display
                     pygame.display.init()
-                    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 
-                                                   pygame.FULLSCREEN | pygame.NOFRAME)
+                    screen = self._set_mode(pygame.FULLSCREEN | pygame.NOFRAME)
                     print(f"Success with driver: {driver}")
                     break
                 except pygame.error as e:
@@ -115,8 +268,54 @@ class LidarHUD:
         except:
             pass
 
+        # Only queue the events we handle; mouse/touch/window churn never reaches Python
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN])
+
         self.font = pygame.font.Font(None, 24)
         self.large_font = pygame.font.Font(None, 32) 
+
+        # Rendered text surfaces keyed by (text, color, font)
+        self._text_cache = {}
+        self.prepare_grid_labels()
+
+        # cos/sin lookup tables at 0.1° resolution for the projection hot paths:
+        # ndarrays for the vectorized LiDAR path, Python lists for scalar lookups
+        table = np.deg2rad(np.arange(TRIG_TABLE_SIZE) / TRIG_STEPS_PER_DEG)
+        self._cos_tbl = np.cos(table).astype(np.float32)
+        self._sin_tbl = np.sin(table).astype(np.float32)
+        self.COS = self._cos_tbl.tolist()
+        self.SIN = self._sin_tbl.tolist()
+
+        # Screen coordinates written by the Numba projection kernel
+        self._out_x = np.empty(LIDAR_MAX_POINTS, np.int32)
+        self._out_y = np.empty(LIDAR_MAX_POINTS, np.int32)
+
+        # The grid never changes: draw it once and blit it every frame
+        self._grid_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.draw_cartesian_grid(self._grid_surface)
+        self._grid_surface = self._grid_surface.convert_alpha()
+
+        # Opaque background (fill + grid) used to erase last frame's dirty regions
+        self._background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self._background.fill(self._rgb('background'))
+        self._background.blit(self._grid_surface, (0, 0))
+        self._dirty = [self.screen.get_rect()]  # Regions drawn last frame; whole screen at start
+
+        # LiDAR point color packed in the display's pixel format for surfarray writes
+        self._lidar_px = self.screen.map_rgb(self._rgb('lidar_pt'))
+
+        # Round 5x5 alpha stamp for LIDAR_STAMP_DOTS mode
+        self._lidar_stamp = pygame.Surface((5, 5), pygame.SRCALPHA)
+        pygame.draw.circle(self._lidar_stamp, self._rgb('lidar_pt'), (2, 2), 2)
+        self._lidar_stamp = self._lidar_stamp.convert_alpha()
+
+        # Object marker circles keyed by (color, radius), rasterized on first use
+        self._obj_stamps = {}
+
+        # Semi-transparent debug overlay with its text, rebuilt only when the counts change
+        self._debug_panel = None
+        self._debug_counts = None
         
         # Load images (will be None if file doesn't exist)
         self.loaded_images = {}
@@ -130,34 +329,55 @@ class LidarHUD:
         self.object_icons = {}
         self.prepare_object_icons()
 
-        # ZMQ subscriber for LiDAR data and object detections
+        # Faded object/text colors per age band
+        self.prepare_fade_colors()
+
+        # ZMQ subscriber for object detections
         self.context = zmq.Context()
         
-        # Configure ZMQ sockets with optimized settings
-        self.lidar_subscriber = self.context.socket(zmq.SUB)
+        # Configure ZMQ socket with optimized settings
         self.object_subscriber = self.context.socket(zmq.SUB)
-        
-        # Set socket options for performance
-        for socket in [self.lidar_subscriber, self.object_subscriber]:
-            socket.setsockopt(zmq.RCVHWM, ZMQ_HWM)  # Receive high water mark
-            socket.setsockopt(zmq.LINGER, 0)  # Don't wait on close
-            socket.setsockopt(zmq.CONFLATE, 1)  # Only keep latest message
-            socket.setsockopt_string(zmq.SUBSCRIBE, "")  # Subscribe to all messages
-
-        # Connect sockets
+        self.object_subscriber.setsockopt(zmq.RCVHWM, ZMQ_HWM)  # Receive high water mark
+        self.object_subscriber.setsockopt(zmq.LINGER, 0)  # Don't wait on close
+        self.object_subscriber.setsockopt(zmq.CONFLATE, 1)  # Only keep latest message
+        self.object_subscriber.setsockopt(zmq.RCVBUF, ZMQ_RCVBUF)  # Bound data queued in the kernel
+        self.object_subscriber.setsockopt(zmq.TCP_KEEPALIVE, 1)  # Detect dead publishers
+        self.object_subscriber.setsockopt_string(zmq.SUBSCRIBE, "")  # Subscribe to all messages
+
+        # Connect socket
         try:
-            self.lidar_subscriber.connect("tcp://localhost:5556")  # LIDAR data
             self.object_subscriber.connect("tcp://localhost:5557")  # Correlated objects
         except zmq.error.ZMQError as e:
             print(f"Failed to connect ZMQ sockets: {e}")
             print("Make sure lidar_zmq_refined is running!")
             sys.exit(1)
 
+        # Started only once the sockets are up, so a failed connect leaks nothing.
+        # LiDAR is received and parsed in a separate process (no GIL contention with
+        # rendering) and handed over through a shared-memory ring of parsed scans
+        self._ring_shm = shared_memory.SharedMemory(
+            create=True, size=RING_HEADER_BYTES + LIDAR_RING_SLOTS * 2 * LIDAR_MAX_POINTS * 4)
+        self._seq_shm = shared_memory.SharedMemory(create=True, size=8)
+        self._ring_header, self._ring_points, self._ring_seq = ring_views(
+            self._ring_shm.buf, self._seq_shm.buf)
+        self._ring_seq[0] = 0
+        ctx = mp.get_context('spawn')  # Fresh interpreter: no inherited SDL/ZMQ state
+        self._lidar_stop = ctx.Event()
+        self._lidar_proc = ctx.Process(target=lidar_worker, daemon=True,
+                                       args=(self._ring_shm.name, self._seq_shm.name, self._lidar_stop))
+        self._lidar_proc.start()
+
         # Initialize data structures with pre-allocated memory
-        self.lidar_points = []
-        self.lidar_angle_map = {}  # Map angles to distances for faster lookup
-        self.detected_objects = []
-        self.object_history = {}
+        # LiDAR scan as parallel float32 arrays (angles_deg, dists_mm), swapped in as one tuple
+        self.lidar_scan = (np.empty(0, np.float32), np.empty(0, np.float32))
+        self.lidar_buckets = self.lidar_scan  # Sorted (bucket_angles, shortest_dists)
+        self.detected_objects = {}  # (class, angle bucket) -> slot index
+        self._obj_records = [TrackedObject() for _ in range(OBJECT_SLOTS)]  # Preallocated per slot
+        self._obj_slots = [None] * OBJECT_SLOTS  # Active TrackedObjects, None for free slots
+        self._obj_free = deque(range(OBJECT_SLOTS))  # Indices of free slots
+        self._last_expiry = 0
+        self.object_history = {}  # obj_id -> row of _hist_arr
+        self._hist_arr = np.zeros((HISTORY_CAPACITY, 3), np.float32)  # [distance, angle, area] per row
         self.history_length = 3  # Increased from 2 to 3 for smoother tracking
         self.last_lidar_update = 0
         self.last_object_update = 0
@@ -173,6 +393,19 @@ class LidarHUD:
         self.data_thread = threading.Thread(target=self.collect_data, daemon=True)
         self.data_thread.start()
     
+    def _set_mode(self, flags):
+        """Open the display on the accelerated SDL2 renderer, falling back to software"""
+        try:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT),
+                                             flags | pygame.SCALED, vsync=1)
+            # The renderer uploads the whole texture on every update, rects or not
+            self._full_redraw = True
+            return screen
+        except pygame.error as e:
+            print(f"Accelerated mode failed: {str(e)}")
+            self._full_redraw = False
+            return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+    
     def prepare_object_icons(self):
         """Create simple icons for different object types"""
         # Define size of icons
@@ -231,13 +464,45 @@ class LidarHUD:
                          (icon_size//4, icon_size//2)]
                 pygame.draw.polygon(icon, color, points)
             
-            self.object_icons[obj_type] = icon
+            self.object_icons[obj_type] = icon.convert_alpha()
+    
+    def prepare_grid_labels(self):
+        """Render the fixed distance and angle grid labels once"""
+        num_lines = MAX_RANGE_MM // GRID_INTERVAL_MM
+        labels = [f"{i * GRID_INTERVAL_MM / 1000.0:.1f}m" for i in range(2, num_lines + 1, 2)]
+        labels += [f"{angle}°" for angle in range(-90, 91, 30) if angle != 0]
+        self._grid_labels = {label: self.font.render(label, True, self._rgb('text'))
+                             for label in labels}
+
+        # Angle labels padded to a square and rotated 90° CCW, keyed by angle
+        self._angle_labels = {}
+        for angle in range(-90, 91, 30):
+            if angle == 0:
+                continue
+            text_surf = self._grid_labels[f"{angle}°"]
+            size = max(text_surf.get_width(), text_surf.get_height()) + 4
+            rotate_surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            rotate_surf.blit(text_surf, ((size - text_surf.get_width()) // 2,
+                                         (size - text_surf.get_height()) // 2))
+            self._angle_labels[angle] = pygame.transform.rotate(rotate_surf, 90)
+    
+    def prepare_fade_colors(self):
+        """Precompute the faded RGB tuples for every object class and age band"""
+        # Band b covers ages [b, b+1) * OBJECT_PERSISTENCE / FADE_BANDS
+        factors = [max(0.3, 1.0 - b / FADE_BANDS) for b in range(FADE_BANDS)]
+
+        def fade(rgb):
+            return [tuple(int(v * f) for v in rgb) for f in factors]
+
+        self.faded_rgb = {obj_type: fade(cfg['rgb']) for obj_type, cfg in BIKE_OBJECTS.items()}
+        self.faded_unknown = fade(RGB['bike_obj'])
+        self.faded_text = fade(RGB['text'])
     
     def load_image(self, path):
         """Load a PNG image from the given path."""
         if os.path.exists(path):
             try:
-                img = pygame.image.load(path)
+                img = pygame.image.load(path).convert_alpha()
                 self.loaded_images[path] = img
                 print(f"Loaded image: {path}")
                 # Use the first loaded image as current
@@ -257,136 +522,174 @@ class LidarHUD:
             return True
         return self.load_image(path)  # Try to load if not already loaded
 
-    def smooth_measurement(self, obj_id, measurement):
-        """Apply exponential moving average smoothing to measurements"""
-        alpha = 0.3  # Reduced from 0.7 to 0.3 for smoother transitions
-        
-        if obj_id not in self.object_history:
-            self.object_history[obj_id] = {
-                'distance': measurement['distance_mm'],
-                'angle': measurement['angle_deg'],
-                'area': measurement['area'],
-                'last_update': time.time()
-            }
-            return measurement
-        
-        hist = self.object_history[obj_id]
-        hist['distance'] = alpha * measurement['distance_mm'] + (1 - alpha) * hist['distance']
-        hist['angle'] = alpha * measurement['angle_deg'] + (1 - alpha) * hist['angle']
-        hist['area'] = alpha * measurement['area'] + (1 - alpha) * hist['area']
-        hist['last_update'] = time.time()
+    def smooth_measurements(self, obj_ids, measurements):
+        """Apply exponential moving average smoothing to a (M, 3) batch; returns the smoothed rows"""
+        hist_idx = self.object_history  # LRU order: least recently used id first
+        hist = self._hist_arr
+        rows = np.empty(len(obj_ids), np.intp)
+        batch = set()
+        for i, obj_id in enumerate(obj_ids):
+            row = hist_idx.pop(obj_id, None)
+            if row is None:
+                if len(hist_idx) < HISTORY_CAPACITY:
+                    row = len(hist_idx)
+                else:
+                    # Recycle the least recently used row, unless every tracked id is in this
+                    # batch (more objects than rows): then this one goes unsmoothed
+                    oldest = next(iter(hist_idx))
+                    if oldest in batch:
+                        rows[i] = -1
+                        continue
+                    row = hist_idx.pop(oldest)
+                hist[row] = measurements[i]  # First sighting passes through unsmoothed
+            hist_idx[obj_id] = row  # (Re)insert at the most recently used end
+            batch.add(obj_id)
+            rows[i] = row
         
-        measurement['distance_mm'] = hist['distance']
-        measurement['angle_deg'] = hist['angle']
-        measurement['area'] = hist['area']
-        return measurement
+        # hist + alpha*(new - hist) over [distance, angle, area] for every object in one op
+        tracked = rows >= 0
+        if not tracked.all():
+            out = measurements.copy()
+            out[tracked] = self.smooth_rows(rows[tracked], measurements[tracked])
+            return out
+        return self.smooth_rows(rows, measurements)
+
+    def smooth_rows(self, rows, measurements):
+        """EMA step for measurements against their history rows; writes the rows back"""
+        hist = self._hist_arr
+        cur = hist[rows]
+        cur += SMOOTHING_ALPHA * (measurements - cur)
+        hist[rows] = cur
+        return cur
 
     def update_lidar_map(self):
-        """Update angle-to-distance map for faster correlation"""
-        self.lidar_angle_map.clear()
-        for angle, dist in self.lidar_points:
-            # Round angle to nearest bucket
-            bucket = round(angle / ANGLE_BUCKET_SIZE) * ANGLE_BUCKET_SIZE
-            # Keep shortest distance for each angle bucket
-            if bucket not in self.lidar_angle_map or dist < self.lidar_angle_map[bucket]:
-                self.lidar_angle_map[bucket] = dist
+        """Update sorted angle-bucket -> shortest-distance arrays for faster correlation"""
+        angles, dists = self.lidar_scan
+        if not len(angles):
+            self.lidar_buckets = (angles, dists)
+            return
+        
+        # Round angles to buckets, sort, and keep the shortest distance per bucket
+        buckets = np.round(angles / ANGLE_BUCKET_SIZE) * ANGLE_BUCKET_SIZE
+        order = np.argsort(buckets, kind='stable')
+        buckets = buckets[order]
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        self.lidar_buckets = (buckets[starts], np.minimum.reduceat(dists[order], starts))
 
     def find_closest_lidar_point(self, target_angle):
         """Find closest LIDAR point to target angle efficiently"""
-        if not self.lidar_angle_map:
+        keys, vals = self.lidar_buckets
+        if not len(keys):
             return None, float('inf')
 
-        # Get angle bucket
-        bucket = round(target_angle / ANGLE_BUCKET_SIZE) * ANGLE_BUCKET_SIZE
+        # Nearest bucket is one of the two neighbours of the insertion point
+        i = int(np.searchsorted(keys, target_angle))
+        lo, hi = max(i - 1, 0), min(i, len(keys) - 1)
+        j = lo if abs(target_angle - keys[lo]) <= abs(keys[hi] - target_angle) else hi
         
-        # Check target bucket and adjacent buckets
-        min_diff = float('inf')
-        best_dist = 0
-        
-        for offset in [0, -ANGLE_BUCKET_SIZE, ANGLE_BUCKET_SIZE]:
-            check_bucket = bucket + offset
-            if check_bucket in self.lidar_angle_map:
-                diff = abs(target_angle - check_bucket)
-                if diff < min_diff:
-                    min_diff = diff
-                    best_dist = self.lidar_angle_map[check_bucket]
+        # Only accept the target bucket or its adjacent buckets
+        bucket = round(target_angle / ANGLE_BUCKET_SIZE) * ANGLE_BUCKET_SIZE
+        if abs(keys[j] - bucket) > ANGLE_BUCKET_SIZE:
+            return 0, float('inf')
         
-        return best_dist, min_diff
+        return float(vals[j]), abs(target_angle - float(keys[j]))
 
     def collect_data(self):
-        """Continuously receive both LiDAR and object detection data from ZMQ."""
+        """Pick up parsed LiDAR scans from the ring and receive object detections from ZMQ."""
         poller = zmq.Poller()
-        poller.register(self.lidar_subscriber, zmq.POLLIN)
         poller.register(self.object_subscriber, zmq.POLLIN)
+        last_seq = 0
         
         while self.running:
             try:
                 socks = dict(poller.poll(POLL_TIMEOUT))
                 current_time = time.time()
                 
-                # Process LIDAR data
-                if self.lidar_subscriber in socks:
-                    msg = self.lidar_subscriber.recv_string(zmq.NOBLOCK)
-                    if msg.startswith("LIDAR_DATA"):
-                        try:
-                            data_str = msg[10:].strip()
-                            self.lidar_points = [
-                                (float(p.split(',')[0]), float(p.split(',')[1]))
-                                for p in data_str.split(';')
-                                if p and ',' in p
-                            ]
-                            self.update_lidar_map()
-                            self.last_lidar_update = current_time
-                        except Exception:
-                            pass
+                # Take the newest scan the LiDAR worker has published
+                seq = int(self._ring_seq[0])
+                if seq != last_seq:
+                    slot = seq % LIDAR_RING_SLOTS
+                    stamp, n = self._ring_header[slot]
+                    n = int(n)
+                    scan = (self._ring_points[slot, 0, :n].copy(),
+                            self._ring_points[slot, 1, :n].copy())
+                    # Seqlock check: once the worker is LIDAR_RING_SLOTS - 1 scans ahead it
+                    # may have started rewriting this slot mid-copy; drop it and retake the newest
+                    if int(self._ring_seq[0]) - seq < LIDAR_RING_SLOTS - 1:
+                        last_seq = seq
+                        self.lidar_scan = scan
+                        self.update_lidar_map()
+                        self.last_lidar_update = stamp
 
                 # Process correlated objects
                 if self.object_subscriber in socks:
-                    msg = self.object_subscriber.recv_string(zmq.NOBLOCK)
+                    frame = recv_latest(self.object_subscriber)
                     try:
-                        data = json.loads(msg)
+                        # json.loads needs bytes/str: frame.bytes copies the message out, and
+                        # json.loads decodes that to str internally
+                        data = json.loads(frame.bytes) if frame is not None else {}
                         if data.get("type") == "OBJECTS" and "objects" in data:
-                            current_time = time.time()
+                            # Bind everything the per-object loop touches to locals once;
+                            # current_time from the poll above is shared by every object
+                            now = current_time
+                            det = self.detected_objects
+                            slots = self._obj_slots
+                            records = self._obj_records
+                            free = self._obj_free
+                            
+                            # Apply smoothing to the whole message at once
+                            # (the correlator always emits these numeric fields)
+                            objects = data["objects"]
+                            smoothed = self.smooth_measurements(
+                                [f"{o['label']}_{int(o['angle_deg'])}" for o in objects],
+                                np.array([(o['distance_mm'], o['angle_deg'], o['area']) for o in objects],
+                                         dtype=np.float32).reshape(-1, 3)).tolist()
                             
                             # Process each object in the message
-                            for obj_data in data["objects"]:
-                                obj = {
-                                    'class': obj_data.get('label', 'unknown'),
-                                    'confidence': float(obj_data.get('confidence', 0)),
-                                    'angle_deg': float(obj_data.get('angle_deg', 0)),
-                                    'distance_mm': float(obj_data.get('distance_mm', 0)),
-                                    'area': float(obj_data.get('area', 10000)),
-                                    'timestamp': current_time,
-                                    'last_seen': current_time
-                                }
-                                
-                                # Apply smoothing
-                                obj_id = f"{obj['class']}_{int(obj['angle_deg'])}"
-                                self.smooth_measurement(obj_id, obj)
-                                
-                                # Update or add object
-                                found = False
-                                for i, existing in enumerate(self.detected_objects):
-                                    if (existing['class'] == obj['class'] and 
-                                        abs(existing['angle_deg'] - obj['angle_deg']) < 5.0):
-                                        # Update existing object
-                                        self.detected_objects[i] = obj
-                                        found = True
-                                        break
+                            for obj_data, (distance_mm, angle_deg, area) in zip(objects, smoothed):
+                                obj_class = obj_data['label']
                                 
-                                if not found:
-                                    self.detected_objects.append(obj)
+                                # Update the object in its (class, angle bucket) slot in place,
+                                # or claim a free slot
+                                key = (obj_class, round(angle_deg / ANGLE_BUCKET_SIZE))
+                                idx = det.get(key)
+                                if idx is not None:
+                                    obj = slots[idx]
+                                elif free:
+                                    idx = free.popleft()
+                                    obj = records[idx]
+                                    obj.key = key
+                                else:
+                                    continue  # Ring full; drop until a slot expires
+                                obj.cls = obj_class
+                                obj.confidence = obj_data['confidence']
+                                obj.angle_deg = angle_deg
+                                obj.distance_mm = distance_mm
+                                obj.area = area
+                                obj.timestamp = now
+                                obj.last_seen = now
+                                if slots[idx] is None:
+                                    # Publish a claimed record only once every field is set,
+                                    # so the render thread never sees it half-filled
+                                    slots[idx] = obj
+                                    det[key] = idx
                             
                             self.last_object_update = current_time
                     except Exception as e:
                         print(f"Error processing objects: {e}")
                         pass
                 
-                # Only remove very old objects (hasn't been updated in OBJECT_PERSISTENCE seconds)
-                self.detected_objects = [
-                    obj for obj in self.detected_objects
-                    if (current_time - obj.get('last_seen', 0)) < OBJECT_PERSISTENCE
-                ]
+                # Only remove very old objects (hasn't been updated in OBJECT_PERSISTENCE seconds),
+                # sweeping the ring once per EXPIRY_INTERVAL rather than per message
+                if current_time - self._last_expiry >= EXPIRY_INTERVAL:
+                    self._last_expiry = current_time
+                    cutoff = current_time - OBJECT_PERSISTENCE
+                    slots = self._obj_slots
+                    for idx, obj in enumerate(slots):
+                        if obj is not None and obj.last_seen < cutoff:
+                            slots[idx] = None
+                            del self.detected_objects[obj.key]
+                            self._obj_free.append(idx)
 
             except zmq.Again:
                 continue
@@ -395,65 +698,84 @@ class LidarHUD:
                 pass
 
     def draw_frame(self):
-        """ Render the Cartesian grid and LiDAR points """
-        self.screen.fill(self._rgb('background'))
-        
-        # Draw debug overlay in top-left
-        debug_lines = [
-            f"Points: {len(self.lidar_points)}",
-            f"Objects: {len(self.detected_objects)}",
-            "---",
-            "ESC: Exit | D: Debug",
-            "L: Toggle LiDAR",
-            "Left/Right: Adjust Angle"
-        ]
+        """
+        Render the Cartesian grid and LiDAR points; returns the screen rects to update,
+        or None when the whole frame is presented (SCALED renderer)
+        """
+        screen = self.screen
+        full_redraw = self._full_redraw
         
-        # Draw semi-transparent background for debug text
-        debug_height = len(debug_lines) * 20 + 10
-        debug_width = 200
-        debug_surface = pygame.Surface((debug_width, debug_height))
-        debug_surface.fill((0,0,0))
-        debug_surface.set_alpha(128)
-        self.screen.blit(debug_surface, (10, 10))
+        # Erase last frame's content by restoring the background (fill + grid) under it
+        background = self._background
+        if full_redraw:
+            screen.blit(background, (0, 0))
+        else:
+            for rect in self._dirty:
+                screen.blit(background, rect, rect)
+        erased = self._dirty
+        dirty = []
         
-        # Draw debug text
-        y = 15
-        for line in debug_lines:
-            text = self.font.render(line, True, self._rgb('text'))
-            self.screen.blit(text, (15, y))
-            y += 20
+        # Draw debug overlay in top-left, re-rendered only when the counts change
+        counts = (len(self.lidar_scan[0]), len(self.detected_objects))
+        if counts != self._debug_counts:
+            self._debug_counts = counts
+            self._debug_panel = self.render_debug_panel(counts)
+        dirty.append(screen.blit(self._debug_panel, (10, 10)))
         
         if self.show_radar:
-            # Draw the Cartesian grid first
-            self.draw_cartesian_grid()
+            # The Cartesian grid is part of the background
             
             # Draw LiDAR points
-            if self.show_lidar:
-                for (angle_deg, dist_mm) in self.lidar_points:
-                    if dist_mm <= 0 or dist_mm > MAX_RANGE_MM:
-                        continue
-                    if dist_mm < 100:  # Filter only extremely close points (<10cm)
-                        continue
+            angles, dists = self.lidar_scan  # Collector thread swaps in whole arrays
+            if self.show_lidar and len(angles):
+                if HAVE_NUMBA:
+                    # Single compiled pass: filter, project and bounds-check into preallocated buffers
+                    n = project_points(angles, dists, self.angle_offset, self._cos_tbl, self._sin_tbl,
+                                       self._out_x, self._out_y)
+                    sx = self._out_x[:n]
+                    sy = self._out_y[:n]
+                else:
+                    # Project every point at once: polar -> Cartesian -> screen in C loops
+                    mask = (dists >= MIN_RANGE_MM) & (dists <= MAX_RANGE_MM)
+                    idx = np.rint((self.angle_offset - angles[mask]) * TRIG_STEPS_PER_DEG)
+                    idx = idx.astype(np.int32) % TRIG_TABLE_SIZE
+                    r_px = dists[mask] * RADAR_SCALE
+                    sx = (CENTER_X + r_px * self._cos_tbl[idx]).astype(np.int32)
+                    sy = (CENTER_Y + r_px * self._sin_tbl[idx]).astype(np.int32)
                     
-                    adjusted_angle = -angle_deg + self.angle_offset
-                    x_mm = dist_mm * math.cos(math.radians(adjusted_angle))
-                    y_mm = dist_mm * math.sin(math.radians(adjusted_angle))
-                    
-                    scale = RADAR_RADIUS / MAX_RANGE_MM
-                    screen_x = CENTER_X + (x_mm * scale)
-                    screen_y = CENTER_Y + (y_mm * scale)
-                    
-                    pygame.draw.circle(self.screen, self._rgb('lidar_pt'),
-                                     (int(screen_x), int(screen_y)), 2)
+                    # Drop points whose splat would leave the screen
+                    on_screen = (sx >= 1) & (sx < SCREEN_WIDTH - 1) & (sy >= 1) & (sy < SCREEN_HEIGHT - 1)
+                    sx = sx[on_screen]
+                    sy = sy[on_screen]
+                
+                # Bounding box of every point, padded for the splat/stamp size
+                if not full_redraw and len(sx):
+                    x0, y0 = int(sx.min()) - 2, int(sy.min()) - 2
+                    dirty.append(pygame.Rect(x0, y0, int(sx.max()) + 3 - x0, int(sy.max()) + 3 - y0))
+                
+                if LIDAR_STAMP_DOTS:
+                    # One C-level blits call over every stamp destination
+                    stamp = self._lidar_stamp
+                    self.screen.blits([(stamp, (x - 2, y - 2))
+                                       for x, y in zip(sx.tolist(), sy.tolist())], doreturn=0)
+                else:
+                    # Splat every point straight into the framebuffer: one fancy-index write per offset
+                    pixels = pygame.surfarray.pixels2d(self.screen)
+                    for dx, dy in LIDAR_SPLAT:
+                        pixels[sx + dx, sy + dy] = self._lidar_px
+                    del pixels  # Release the surface lock before further blits
             
             # Draw detected objects
-            for obj in self.detected_objects:
-                self.draw_object(obj)
+            for obj in self._obj_slots:
+                if obj is not None:
+                    rect = self.draw_object(obj)
+                    if rect is not None:
+                        dirty.append(rect)
             
             # Draw current angle offset
             offset_text = f"Angle Offset: {self.angle_offset}°"
-            offset_surf = self.font.render(offset_text, True, self._rgb('text'))
-            self.screen.blit(offset_surf, (10, 30))
+            offset_surf = self._text(offset_text, self._rgb('text'))
+            dirty.append(screen.blit(offset_surf, (10, 30)))
             
             # Draw controls help (right side)
             controls_text = [
@@ -464,33 +786,61 @@ class LidarHUD:
             ]
             y_pos = 50
             for text in controls_text:
-                controls_surf = self.font.render(text, True, self._rgb('text'))
+                controls_surf = self._text(text, self._rgb('text'))
                 x_pos = SCREEN_WIDTH - controls_surf.get_width() - 10
-                self.screen.blit(controls_surf, (x_pos, y_pos))
+                dirty.append(screen.blit(controls_surf, (x_pos, y_pos)))
                 y_pos += 25
         
         # Exit instruction - make it more visible
         exit_text = "Press ESC to exit"
-        exit_surf = self.large_font.render(exit_text, True, self._rgb('text'))
+        exit_surf = self._text(exit_text, self._rgb('text'), self.large_font)
         exit_x = CENTER_X - exit_surf.get_width()//2
         exit_y = SCREEN_HEIGHT - exit_surf.get_height() - 10
-        pygame.draw.rect(self.screen, self._rgb('background'), 
-                        (exit_x-5, exit_y-5, exit_surf.get_width()+10, exit_surf.get_height()+10))
-        self.screen.blit(exit_surf, (exit_x, exit_y))
+        dirty.append(pygame.draw.rect(screen, self._rgb('background'),
+                        (exit_x-5, exit_y-5, exit_surf.get_width()+10, exit_surf.get_height()+10)))
+        screen.blit(exit_surf, (exit_x, exit_y))
+
+        if full_redraw:
+            return None
+
+        # Both the erased and the newly drawn regions must reach the display
+        self._dirty = dirty
+        return erased + dirty
+
+    def render_debug_panel(self, counts):
+        """Compose the semi-transparent debug background and its text into one surface"""
+        debug_lines = [
+            f"Points: {counts[0]}",
+            f"Objects: {counts[1]}",
+            "---",
+            "ESC: Exit | D: Debug",
+            "L: Toggle LiDAR",
+            "Left/Right: Adjust Angle"
+        ]
+        panel = pygame.Surface((200, MAX_DEBUG_LINES * 20 + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 128))
+        y = 5
+        text_color = self._rgb('text')
+        for i, line in enumerate(debug_lines):
+            # The counts change every scan and the panel itself is cached: render them
+            # directly instead of filling the shared text cache with one-off entries
+            surf = self.font.render(line, True, text_color) if i < 2 else self._text(line, text_color)
+            panel.blit(surf, (5, y))
+            y += 20
+        return panel.convert_alpha()
 
     def draw_object(self, obj, surface=None, alpha=255):
-        """Draw a detected object using Cartesian coordinates"""
+        """Draw a detected object using Cartesian coordinates; returns the drawn rect or None"""
         if surface is None:
             surface = self.screen
             
         # Get object properties
-        obj_class = obj.get('class', 'object').lower()
-        angle_deg = obj.get('angle_deg', 0)
-        distance_mm = obj.get('distance_mm', 0)
-        bbox_area = obj.get('area', 10000)
-        confidence = obj.get('confidence', 0)
-        last_seen = obj.get('last_seen', 0)
-        age = time.time() - last_seen
+        obj_class = obj.cls.lower()
+        angle_deg = obj.angle_deg
+        distance_mm = obj.distance_mm
+        bbox_area = obj.area
+        confidence = obj.confidence
+        age = time.time() - obj.last_seen
         
         # Skip invalid measurements
         if distance_mm <= 0 or distance_mm > MAX_RANGE_MM:
@@ -500,95 +850,101 @@ class LidarHUD:
         adjusted_angle = -angle_deg + self.angle_offset
         
         # Convert polar coordinates (distance, angle) to Cartesian (x, y)
-        x_mm = distance_mm * math.cos(math.radians(adjusted_angle))
-        y_mm = distance_mm * math.sin(math.radians(adjusted_angle))
+        cos_a, sin_a = self._cs(adjusted_angle)
+        x_mm = distance_mm * cos_a
+        y_mm = distance_mm * sin_a
         
         # Scale distances to screen coordinates
-        scale = RADAR_RADIUS / MAX_RANGE_MM
-        screen_x = CENTER_X + (x_mm * scale)
-        screen_y = CENTER_Y + (y_mm * scale)
+        screen_x = CENTER_X + (x_mm * RADAR_SCALE)
+        screen_y = CENTER_Y + (y_mm * RADAR_SCALE)
         
         # Calculate circle radius based on bbox area
         min_radius = 5
         max_radius = 20
         area_scale = min(1.0, bbox_area / 100000)
         radius = int(min_radius + (max_radius - min_radius) * area_scale)
+        radius += radius & 1  # Round odd radii up to even, to keep the stamp cache small
         
         # Choose color and fade based on age
-        if obj_class in BIKE_OBJECTS:
-            base_color = BIKE_OBJECTS[obj_class]['color']
-        else:
-            base_color = COLORS['bike_obj']
-            
-        # Extract RGB components
-        r = (base_color >> 16) & 0xFF
-        g = (base_color >> 8) & 0xFF
-        b = base_color & 0xFF
-        
-        # Fade color based on age
-        fade_factor = max(0.3, 1.0 - (age / OBJECT_PERSISTENCE))
-        color = (int(r * fade_factor), int(g * fade_factor), int(b * fade_factor))
+        band = min(FADE_BANDS - 1, int((age / OBJECT_PERSISTENCE) * FADE_BANDS))
+        color = self.faded_rgb.get(obj_class, self.faded_unknown)[band]
             
         # Make sure screen coordinates are valid
         if (0 <= screen_x <= SCREEN_WIDTH) and (0 <= screen_y <= SCREEN_HEIGHT):
-            # Draw the object circle
-            pygame.draw.circle(surface, color, (int(screen_x), int(screen_y)), radius)
-            
-            # Draw object info with fade effect
-            conf = confidence * 100
-            if distance_mm < 1000:
-                distance_text = f"{distance_mm/1000:.3f}m"
-            else:
-                distance_text = f"{distance_mm/1000:.2f}m"
-                
-            label_text = f"{obj_class} ({conf:.0f}%)\n{distance_text}\n{-angle_deg:.0f}°"
-            
-            # Split and render each line of text
-            lines = label_text.split('\n')
-            line_height = self.font.get_height()
-            total_height = line_height * len(lines)
-            text_y = int(screen_y) - radius - total_height - 5
+            # Draw the object circle from its pre-rendered stamp
+            rect = surface.blit(self._circle_stamp(color, radius),
+                                (int(screen_x) - radius, int(screen_y) - radius))
             
+            # Draw object info with fade effect, quantized (5% confidence, 0.1m, 1°)
+            # so jittery measurements keep hitting the same cached label
+            label = self._object_label(obj_class, round(confidence * 20) * 5,
+                                       round(distance_mm / 100), round(-angle_deg), band)
+            return rect.union(surface.blit(label, (int(screen_x) - label.get_width()//2,
+                                                   int(screen_y) - radius - label.get_height() - 5)))
+        return None
+
+    def _circle_stamp(self, color, radius):
+        """Return the cached filled-circle sprite for (color, radius)"""
+        stamp = self._obj_stamps.get((color, radius))
+        if stamp is None:
+            stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color, (radius, radius), radius)
+            stamp = stamp.convert_alpha()
+            self._obj_stamps[(color, radius)] = stamp
+        return stamp
+
+    def _object_label(self, obj_class, conf_q, dist_q, ang_q, band):
+        """Render (or fetch) the three-line object label as one cached surface"""
+        key = (obj_class, conf_q, dist_q, ang_q, band)
+        cache = self._text_cache
+        surf = cache.pop(key, None)
+        if surf is None:
             # Fade text color too
-            text_color = tuple(int(c * fade_factor) for c in self._rgb('text'))
-            
-            for line in lines:
-                text_surf = self.font.render(line, True, text_color)
-                text_x = int(screen_x) - text_surf.get_width()//2
-                surface.blit(text_surf, (text_x, text_y))
-                text_y += line_height
-
-    def draw_cartesian_grid(self):
-        """ Draw a Cartesian coordinate grid """
+            text_color = self.faded_text[band]
+            # Lines are rendered directly: only the composite is ever reused
+            font = self.font
+            lines = [font.render(line, True, text_color) for line in
+                     (f"{obj_class} ({conf_q}%)", f"{dist_q / 10:.1f}m", f"{ang_q}°")]
+            line_height = font.get_height()
+            surf = pygame.Surface((max(line.get_width() for line in lines), line_height * len(lines)),
+                                  pygame.SRCALPHA)
+            for i, line in enumerate(lines):
+                surf.blit(line, ((surf.get_width() - line.get_width())//2, i * line_height))
+            if len(cache) >= TEXT_CACHE_SIZE:
+                # Evict the least recently used entry (dicts keep insertion order)
+                del cache[next(iter(cache))]
+        cache[key] = surf  # (Re)insert at the most recently used end
+        return surf
+
+    def draw_cartesian_grid(self, surface):
+        """ Draw a Cartesian coordinate grid onto surface """
         # Draw main circle for radar bounds
-        pygame.draw.circle(self.screen, self._rgb('radar_grid'), 
+        pygame.draw.circle(surface, self._rgb('radar_grid'), 
                          (CENTER_X, CENTER_Y), RADAR_RADIUS, 1)
         
         # Draw main axes
-        pygame.draw.line(self.screen, self._rgb('radar_line'),
+        pygame.draw.line(surface, self._rgb('radar_line'),
                         (CENTER_X - RADAR_RADIUS, CENTER_Y),  # X axis
                         (CENTER_X + RADAR_RADIUS, CENTER_Y), 2)
-        pygame.draw.line(self.screen, self._rgb('radar_line'),
+        pygame.draw.line(surface, self._rgb('radar_line'),
                         (CENTER_X, CENTER_Y - RADAR_RADIUS),  # Y axis (full)
                         (CENTER_X, CENTER_Y + RADAR_RADIUS), 2)
         
         # Draw grid lines every 0.5m
-        grid_interval_mm = 500  # 0.5m
-        num_lines = int(MAX_RANGE_MM / grid_interval_mm)
+        num_lines = int(MAX_RANGE_MM / GRID_INTERVAL_MM)
         
         # Draw concentric circles for distance
         for i in range(1, num_lines + 1):
-            radius = int((i * grid_interval_mm / MAX_RANGE_MM) * RADAR_RADIUS)
+            radius = int((i * GRID_INTERVAL_MM / MAX_RANGE_MM) * RADAR_RADIUS)
             # Draw as dashed circle
-            pygame.draw.circle(self.screen, self._rgb('radar_grid'), 
+            pygame.draw.circle(surface, self._rgb('radar_grid'), 
                              (CENTER_X, CENTER_Y), radius, 1)
             
             # Add distance label
-            distance_m = i * grid_interval_mm / 1000.0
+            distance_m = i * GRID_INTERVAL_MM / 1000.0
             if i % 2 == 0:  # Only label every 1m
-                distance_text = f"{distance_m:.1f}m"
-                text_surf = self.font.render(distance_text, True, self._rgb('text'))
-                self.screen.blit(text_surf, 
+                text_surf = self._grid_labels[f"{distance_m:.1f}m"]
+                surface.blit(text_surf, 
                                (CENTER_X + radius - text_surf.get_width()//2,
                                 CENTER_Y + 5))
         
@@ -596,72 +952,90 @@ class LidarHUD:
         for angle in range(-90, 91, 30):  # Every 30 degrees from -90 to +90
             if angle == 0:
                 continue  # Skip 0 degrees, already drawn as Y axis
-            rad = math.radians(angle)
+            cos_a, sin_a = self._cs(angle)
             # Calculate end point for angle line
-            end_x = CENTER_X + RADAR_RADIUS * math.cos(rad)
-            end_y = CENTER_Y + RADAR_RADIUS * math.sin(rad)
+            end_x = CENTER_X + RADAR_RADIUS * cos_a
+            end_y = CENTER_Y + RADAR_RADIUS * sin_a
             
             # Draw line from center to edge at specified angle
-            pygame.draw.line(self.screen, self._rgb('radar_grid'),
+            pygame.draw.line(surface, self._rgb('radar_grid'),
                            (CENTER_X, CENTER_Y), (end_x, end_y), 1)
             
-            # Add angle label at the edge
-            label = f"{angle}°"
-            text_surf = self.font.render(label, True, self._rgb('text'))
-            
-            # Create a surface for rotation that's large enough
-            size = max(text_surf.get_width(), text_surf.get_height()) + 4
-            rotate_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            
-            # Position the text in the center of the rotation surface
-            text_x = (size - text_surf.get_width()) // 2
-            text_y = (size - text_surf.get_height()) // 2
-            rotate_surf.blit(text_surf, (text_x, text_y))
-            
-            # Rotate 90° CCW and translate
-            rotated = pygame.transform.rotate(rotate_surf, 90)
+            # Add the pre-rotated angle label at the edge
+            rotated = self._angle_labels[angle]
             
             # Calculate position for rotated text, shifted to start from bottom (180° shift)
-            rad_text = math.radians(angle + 90)  # Shift text position to start from bottom
-            label_x = CENTER_X + (RADAR_RADIUS + 25) * math.cos(rad_text) - rotated.get_width()//2
-            label_y = CENTER_Y + (RADAR_RADIUS + 25) * math.sin(rad_text) - rotated.get_height()//2
+            cos_t, sin_t = self._cs(angle + 90)  # Shift text position to start from bottom
+            label_x = CENTER_X + (RADAR_RADIUS + 25) * cos_t - rotated.get_width()//2
+            label_y = CENTER_Y + (RADAR_RADIUS + 25) * sin_t - rotated.get_height()//2
             
             # Draw the rotated text
-            self.screen.blit(rotated, (label_x, label_y))
+            surface.blit(rotated, (label_x, label_y))
+
+    def _text(self, s, color, font=None):
+        """Render text through the surface cache; FreeType only runs on a miss"""
+        if font is None:
+            font = self.font
+        key = (s, color, font)
+        cache = self._text_cache
+        surf = cache.pop(key, None)
+        if surf is None:
+            if len(cache) >= TEXT_CACHE_SIZE:
+                # Evict the least recently used entry (dicts keep insertion order)
+                del cache[next(iter(cache))]
+            surf = font.render(s, True, color)
+        cache[key] = surf  # (Re)insert at the most recently used end
+        return surf
+
+    def _cs(self, deg):
+        """Look up (cos, sin) of an angle in degrees from the precomputed tables"""
+        i = int(deg * TRIG_STEPS_PER_DEG) % TRIG_TABLE_SIZE
+        return self.COS[i], self.SIN[i]
 
     def _rgb(self, key):
-        """ Convert a 0xAARRGGBB color into (R, G, B) for Pygame. """
-        c = COLORS[key]
-        r = (c >> 16) & 0xFF
-        g = (c >> 8)  & 0xFF
-        b = c & 0xFF
-        return (r, g, b)
+        """ Look up the precomputed (R, G, B) tuple of a named color. """
+        return RGB[key]
 
     def run(self):
         """ Main Pygame loop. """
         clock = pygame.time.Clock()
-        while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+        try:
+            while self.running:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
                         self.running = False
-                    elif event.key == pygame.K_l:
-                        self.show_lidar = not self.show_lidar
-                    elif event.key == pygame.K_LEFT:
-                        self.angle_offset -= 1
-                    elif event.key == pygame.K_RIGHT:
-                        self.angle_offset += 1
-
-            self.draw_frame()
-            pygame.display.flip()
-            clock.tick(MAX_FPS)  # Increased to 120 FPS
-
-        # Cleanup
-        self.lidar_subscriber.close()
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            self.running = False
+                        elif event.key == pygame.K_l:
+                            self.show_lidar = not self.show_lidar
+                        elif event.key == pygame.K_LEFT:
+                            self.angle_offset -= 1
+                        elif event.key == pygame.K_RIGHT:
+                            self.angle_offset += 1
+
+                # Only push the regions that changed to the display; SCALED presents whole frames
+                rects = self.draw_frame()
+                if rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
+                clock.tick(MAX_FPS)  # Increased to 120 FPS
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the LiDAR worker and collector, then release ZMQ, shared memory and pygame"""
+        self.running = False
+        self._lidar_stop.set()
+        self._lidar_proc.join(timeout=1.0)
+        self.data_thread.join(timeout=1.0)
         self.object_subscriber.close()
         self.context.term()
+        self._ring_header = self._ring_points = self._ring_seq = None
+        for shm in (self._ring_shm, self._seq_shm):
+            shm.close()
+            shm.unlink()
         pygame.quit()
         print("Exiting Lidar HUD.")
 
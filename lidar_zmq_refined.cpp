@@ -22,6 +22,9 @@ using namespace std;
 #define ZMQ_PORT_PUB "5556"      // Raw LIDAR data
 #define ZMQ_PORT_SUB "5555"      // Camera detections
 #define ZMQ_PORT_OBJ "5557"      // Correlated objects
+#define ZMQ_IPC_PUB "ipc:///tmp/lidar.ipc"  // Raw LIDAR data for same-host subscribers
+#define LIDAR_TOPIC "LIDAR_DATA"  // Topic prefix of binary LIDAR frames
+#define LIDAR_TOPIC_LEN 10
 #define MAX_ANGLE_DIFF 10.0      // Maximum angle difference for correlation
 #define ANGLE_RESOLUTION 1.0     // Only send points every 1 degree
 #define MIN_DISTANCE_MM 100      // Ignore points closer than 10cm
@@ -299,12 +302,13 @@ int main(int argc, const char *argv[]) {
         string address_sub = "tcp://localhost:" + string(ZMQ_PORT_SUB);
 
         g_publisher->bind(address_pub);
+        g_publisher->bind(ZMQ_IPC_PUB);  // Same-host subscribers skip the TCP stack
         g_corr_publisher->bind(address_obj);
         g_subscriber->connect(address_sub);
         g_subscriber->set(zmq::sockopt::subscribe, "");
 
         cout << "LiDAR system initialized:" << endl
-             << "- Publishing LIDAR data on port " << ZMQ_PORT_PUB << (g_publish_lidar_data ? "" : " (disabled)") << endl
+             << "- Publishing LIDAR data on port " << ZMQ_PORT_PUB << " and " << ZMQ_IPC_PUB << (g_publish_lidar_data ? "" : " (disabled)") << endl
              << "- Publishing correlated objects on port " << ZMQ_PORT_OBJ << endl
              << "- Subscribing to camera detections on port " << ZMQ_PORT_SUB << endl
              << "- Send SIGUSR1 signal to toggle LIDAR data publishing" << endl;
@@ -480,16 +484,16 @@ int main(int argc, const char *argv[]) {
 
         // Send downsampled LIDAR data in batches
         if (!downsampledPoints.empty() && g_publish_lidar_data) {
-            stringstream ss;
-            ss << "LIDAR_DATA ";
-            
-            // Send all points immediately without batching
+            // Binary frame: "LIDAR_DATA" topic followed by packed float32 (angle, distance)
+            // pairs in host byte order (little-endian on the Pi)
+            string msg(LIDAR_TOPIC);
+            msg.reserve(LIDAR_TOPIC_LEN + downsampledPoints.size() * 2 * sizeof(float));
             for (const auto &kv : downsampledPoints) {
-                ss << kv.first << "," << kv.second << ";";
+                const float point[2] = {static_cast<float>(kv.first), kv.second};
+                msg.append(reinterpret_cast<const char*>(point), sizeof(point));
             }
-            
+
             try {
-                string msg = ss.str();
                 zmq::message_t message(msg.size());
                 memcpy(message.data(), msg.c_str(), msg.size());
                 g_publisher->send(message, zmq::send_flags::dontwait);
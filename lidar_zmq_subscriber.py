@@ -1,28 +1,42 @@
 import zmq
 import time
+import numpy as np
 
 print("Initializing ZMQ subscriber...")
 context = zmq.Context()
 subscriber = context.socket(zmq.SUB)
+subscriber.setsockopt(zmq.RCVBUF, 4 << 20)  # 4 MiB receive buffer absorbs scan bursts
+subscriber.setsockopt(zmq.RCVHWM, 0)  # No HWM: every scan is counted, the drain loop keeps up
 
 print("Connecting to publisher...")
-subscriber.connect("tcp://localhost:5556")
+subscriber.connect("ipc:///tmp/lidar.ipc")  # Same host: Unix socket instead of TCP loopback
 print("Setting subscription filter...")
 subscriber.setsockopt_string(zmq.SUBSCRIBE, "LIDAR_DATA")
 print("Ready to receive messages!")
 
+poller = zmq.Poller()
+poller.register(subscriber, zmq.POLLIN)
+
 message_count = 0
 while True:
     try:
-        message = subscriber.recv_string()
-        message_count += 1
-        if message_count % 10 == 0:  # Print every 10th message
-            print(f"Received message {message_count}")
-            # Print first few measurements as sample
-            parts = message.split(';')
-            for i, part in enumerate(parts[:5]):  # Show first 5 measurements
-                if part.strip():
-                    print(f"Measurement {i}: {part}")
+        if not poller.poll(100):
+            continue
+        # Drain everything queued since the last wake-up
+        while True:
+            try:
+                message = subscriber.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            message_count += 1
+            if message_count % 10 == 0:  # Print every 10th message
+                # View the float32 (angle, distance) pairs after the topic without copying
+                meas = np.frombuffer(message, dtype='<f4', offset=10,
+                                     count=(len(message) - 10) // 8 * 2).reshape(-1, 2)
+                print(f"Received message {message_count} ({len(meas)} points)")
+                # Print first few measurements as sample
+                for i, (angle, distance) in enumerate(meas[:5].tolist()):
+                    print(f"Measurement {i}: {angle:g},{distance:g}")
     except KeyboardInterrupt:
         print("\nStopping subscriber...")
         break
@@ -1,29 +1,50 @@
-import smbus
+from smbus2 import SMBus, i2c_msg
 import time
-import math
+import struct
 import sys
+import numpy as np
+
+SAMPLE_INTERVAL = 0.01      # 100 Hz sampling between block reads
+SAMPLES_PER_READING = 10    # Samples averaged into each printed reading (10 Hz output)
+
+# Raw int16 -> physical units for [acc x, y, z, gyro x, y, z]
+ACCEL_SCALE = 1 / 16384.0   # Full scale range ±2g
+GYRO_SCALE = 1 / 131.0      # Full scale range ±250°/s
+SAMPLE_SCALE = np.array([ACCEL_SCALE] * 3 + [GYRO_SCALE] * 3)
+
+ACCEL_XOUT_H = 0x3B         # First of the 14 accel/temp/gyro data registers
+SAMPLE_BYTES = 14
+
+def compute_angles(acc):
+    """Roll and pitch in degrees for an (N, 3) array of accelerations in g"""
+    ax, ay, az = acc[:, 0], acc[:, 1], acc[:, 2]
+    roll = np.degrees(np.arctan2(ay, az))
+    pitch = np.degrees(np.arctan2(-ax, np.hypot(ay, az)))
+    return roll, pitch
 
 class MPU6050:
     def __init__(self, bus_num=1, address=0x68):
         print(f"Initializing MPU6050 on bus {bus_num} at address 0x{address:02X}")
         try:
-            self.bus = smbus.SMBus(bus_num)
+            self.bus = SMBus(bus_num)
             print("I2C bus opened successfully")
         except Exception as e:
             print(f"Failed to open I2C bus: {e}")
             sys.exit(1)
             
         self.address = address
+
+        # Register-pointer write + 14-byte read, sent as one repeated-START transaction
+        # by i2c_rdwr; built once and refilled on every sample
+        self._select_data = i2c_msg.write(address, [ACCEL_XOUT_H])
+        self._read_data = i2c_msg.read(address, SAMPLE_BYTES)
         
-        # Check if device is responding
+        # Wake up the MPU6050 (clear SLEEP in PWR_MGMT_1); this also proves the device answers
         try:
-            # Try to read WHO_AM_I register (should return 0x68)
-            who_am_i = self.bus.read_byte_data(self.address, 0x75)
-            print(f"WHO_AM_I register returned: 0x{who_am_i:02X}")
-            if who_am_i != 0x68:
-                print(f"Warning: Unexpected WHO_AM_I value. Expected 0x68, got 0x{who_am_i:02X}")
+            self.bus.write_byte_data(self.address, 0x6B, 0)
+            print("MPU6050 initialized successfully")
         except Exception as e:
-            print(f"Failed to read WHO_AM_I register: {e}")
+            print(f"Failed to wake up MPU6050: {e}")
             print("\nTroubleshooting tips:")
             print("1. Check your wiring:")
             print("   - SDA → GPIO2 (Pin 3)")
@@ -34,53 +55,31 @@ class MPU6050:
             print("3. Check for loose connections")
             print("4. Try running 'sudo i2cdetect -y 1' to see if device is detected")
             sys.exit(1)
-        
-        # Wake up the MPU6050
-        try:
-            print("Attempting to wake up MPU6050...")
-            self.bus.write_byte_data(self.address, 0x6B, 0)
-            print("MPU6050 initialized successfully")
-        except Exception as e:
-            print(f"Failed to wake up MPU6050: {e}")
-            sys.exit(1)
 
-    def read_raw_data(self, addr):
-        try:
-            # Read raw 16-bit value
-            high = self.bus.read_byte_data(self.address, addr)
-            low = self.bus.read_byte_data(self.address, addr + 1)
-
-            # Combine high and low for 16-bit value
-            value = (high << 8) + low
+    def read_samples(self, count):
+        """Read count samples SAMPLE_INTERVAL apart as an (N, 6) array [acc x/y/z (g), gyro x/y/z (°/s)]"""
+        raw = np.empty((count, 6))
+        for i in range(count):
+            if i:
+                time.sleep(SAMPLE_INTERVAL)
+            # One burst read of ACCEL_XOUT_H..GYRO_ZOUT_L: accel x/y/z, temp, gyro x/y/z
+            self.bus.i2c_rdwr(self._select_data, self._read_data)
+            ax, ay, az, _temp, gx, gy, gz = struct.unpack('>hhhhhhh', bytes(self._read_data))
+            raw[i] = (ax, ay, az, gx, gy, gz)
+        return raw * SAMPLE_SCALE
 
-            # Get signed value
-            if value > 32768:
-                value = value - 65536
-            return value
-        except Exception as e:
-            print(f"Error reading from address 0x{addr:02X}: {e}")
-            raise
-
-    def get_data(self):
+    def get_data(self, samples=1):
         try:
-            # Read accelerometer data
-            acc_x = self.read_raw_data(0x3B) / 16384.0  # Full scale range ±2g
-            acc_y = self.read_raw_data(0x3D) / 16384.0
-            acc_z = self.read_raw_data(0x3F) / 16384.0
-
-            # Read gyroscope data
-            gyro_x = self.read_raw_data(0x43) / 131.0  # Full scale range ±250°/s
-            gyro_y = self.read_raw_data(0x45) / 131.0
-            gyro_z = self.read_raw_data(0x47) / 131.0
-
-            # Calculate roll and pitch (in degrees)
-            roll = math.atan2(acc_y, acc_z) * 180/math.pi
-            pitch = math.atan2(-acc_x, math.sqrt(acc_y*acc_y + acc_z*acc_z)) * 180/math.pi
+            # Average a window of samples, then take roll/pitch of the mean acceleration
+            # (averaging per-sample angles breaks where roll wraps at ±180°)
+            mean = self.read_samples(samples).mean(axis=0)
+            roll, pitch = compute_angles(mean[None, :3])
+            acc_x, acc_y, acc_z, gyro_x, gyro_y, gyro_z = mean.tolist()
 
             return {
                 'acceleration': {'x': acc_x, 'y': acc_y, 'z': acc_z},
                 'gyroscope': {'x': gyro_x, 'y': gyro_y, 'z': gyro_z},
-                'angles': {'roll': roll, 'pitch': pitch}
+                'angles': {'roll': float(roll[0]), 'pitch': float(pitch[0])}
             }
         except Exception as e:
             print(f"Error getting sensor data: {e}")
@@ -94,7 +93,7 @@ def main():
         
         while True:
             try:
-                data = mpu.get_data()
+                data = mpu.get_data(SAMPLES_PER_READING)
                 
                 print("\n" + "="*50)
                 print("Acceleration (g):")
@@ -110,8 +109,6 @@ def main():
                 print("\nOrientation (°):")
                 print(f"Roll:  {data['angles']['roll']:>8.3f}")
                 print(f"Pitch: {data['angles']['pitch']:>8.3f}")
-                
-                time.sleep(0.1)  # Read at 10Hz
             except Exception as e:
                 print(f"Error in main loop: {e}")
                 break
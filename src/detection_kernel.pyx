@@ -0,0 +1,55 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# -----------------------------------------------------------------------------------------------
+# Typed per-detection filter for docker_detection_refined.build_detection_list
+# Build in place with:  cythonize -3 -i detection_kernel.pyx
+# -----------------------------------------------------------------------------------------------
+
+def process(list raw_detections, double image_w, double image_h, double min_area, double px_to_deg,
+            list pool=None, list out=None):
+    """
+    Given (label, confidence, normalized bbox, track_id) tuples, return the detection dicts
+    whose pixel bbox area is at least min_area and whose angle is within the front 180°.
+    Same fields and values as the NumPy path in docker_detection_refined, including
+    overwriting dicts from `pool` and refilling `out` when they are given.
+    """
+    cdef double xmin, ymin, xmax, ymax
+    cdef double x0, y0, x1, y1, area, angle
+    cdef double center_x = image_w * 0.5
+    cdef list detection_list = [] if out is None else out
+    cdef Py_ssize_t n = 0
+    cdef Py_ssize_t n_pool = 0 if pool is None else len(pool)
+    cdef dict det_data
+
+    detection_list.clear()
+
+    for label, confidence, bbox, track_id in raw_detections:
+        xmin, ymin, xmax, ymax = bbox
+
+        # Convert normalized coords to pixel coords
+        x0 = xmin * image_w
+        y0 = ymin * image_h
+        x1 = xmax * image_w
+        y1 = ymax * image_h
+
+        # Skip small detections
+        area = (x1 - x0) * (y1 - y0)
+        if area < min_area:
+            continue
+
+        # Only include detections within LiDAR's front 180° field of view
+        angle = ((x0 + x1) * 0.5 - center_x) * px_to_deg
+        if angle < -90.0 or angle > 90.0:
+            continue
+
+        det_data = pool[n] if n < n_pool else {}
+        n += 1
+        det_data['label'] = label
+        det_data['confidence'] = float(confidence)
+        det_data['angle_deg'] = angle
+        det_data['area'] = area
+        det_data['bbox'] = [x0, y0, x1, y1]
+        det_data['bbox_norm'] = [xmin, ymin, xmax, ymax]
+        det_data['track_id'] = track_id
+        detection_list.append(det_data)
+
+    return detection_list
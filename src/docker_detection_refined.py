@@ -2,6 +2,7 @@ import gi
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
 import os
+import contextlib
 import numpy as np
 import cv2
 import hailo
@@ -9,6 +10,8 @@ import zmq
 import json
 import time
 import math
+import threading
+from collections import deque
 
 from hailo_apps_infra.hailo_rpi_common import (
     get_caps_from_pad,
@@ -17,6 +20,23 @@ from hailo_apps_infra.hailo_rpi_common import (
 )
 from hailo_apps_infra.detection_pipeline import GStreamerDetectionApp
 
+# Compiled detection filter (detection_kernel.pyx, built with `cythonize -3 -i`) is optional:
+# without it build_detection_list uses the NumPy batch path
+try:
+    import detection_kernel
+except ImportError:
+    detection_kernel = None
+
+# orjson is optional: it encodes straight to UTF-8 bytes in C; stdlib json is the fallback
+try:
+    import orjson
+
+    def encode_message(message):
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def encode_message(message):
+        return json.dumps(message).encode()
+
 # -----------------------------------------------------------------------------------------------
 # Camera / Aspect Ratio Parameters
 # -----------------------------------------------------------------------------------------------
@@ -27,9 +47,16 @@ IMAGE_WIDTH      = 1920.0   # Pipeline's actual width in pixels
 IMAGE_HEIGHT     = 1080.0   # Pipeline's actual height in pixels
 PROCESS_INTERVAL = 2.0      # Process detections every N seconds
 MIN_BBOX_AREA = 50000      # Minimum bounding box area in pixels²
+CPU_AFFINITY  = {2, 3}     # Cores for the pipeline; 0 and 1 stay free for the system
+RT_PRIORITY   = 50         # SCHED_FIFO priority (needs CAP_SYS_NICE, e.g. run as root)
+DETECTION_POOL_SIZE = 32   # Reused detection dicts; frames with more allocate the extras
+ZMQ_SOCKET_BUFFER  = 4 << 20   # 4 MiB kernel send buffer so bursts never block in the stack
+ZMQ_KEEPALIVE_IDLE = 30        # Seconds idle before TCP keepalive probes detect a dead peer
 
-# Debug mode to print detailed angle calculations
-DEBUG_ANGLES = True
+# Debug mode to print detailed angle calculations and per-detection summaries.
+# Off by default: stdout writes serialize the GStreamer callback. Under `python -O`
+# the `__debug__ and DEBUG_ANGLES` blocks are stripped from the bytecode entirely.
+DEBUG_ANGLES = False
 
 # -----------------------------------------------------------------------------------------------
 # Compute Horizontal FOV from the diagonal FOV
@@ -45,27 +72,32 @@ def compute_horizontal_fov(diag_fov_deg, width, height):
     horizontal_fov_rad = 2.0 * math.atan(horizontal_scale * math.tan(diag_fov_rad / 2.0))
     return math.degrees(horizontal_fov_rad)
 
-CAMERA_HFOV_DEG = compute_horizontal_fov(DIAGONAL_FOV_DEG, ASPECT_WIDTH, ASPECT_HEIGHT)
+# compute_horizontal_fov(DIAGONAL_FOV_DEG, ASPECT_WIDTH, ASPECT_HEIGHT), evaluated offline;
+# recompute if the camera or aspect ratio changes
+CAMERA_HFOV_DEG = 70.42796571601109
 IMAGE_CENTER_X  = IMAGE_WIDTH / 2.0
+PX_TO_DEG       = CAMERA_HFOV_DEG / IMAGE_WIDTH  # Degrees per pixel of horizontal offset
+
+# Hailo lookups resolved once instead of per frame / per detection
+HAILO_DETECTION = hailo.HAILO_DETECTION
+HAILO_UNIQUE_ID = hailo.HAILO_UNIQUE_ID
+get_roi_from_buffer = hailo.get_roi_from_buffer
 
-print(f"Camera Parameters:")
-print(f"- Horizontal FOV: {CAMERA_HFOV_DEG:.1f}°")
-print(f"- Image Center: {IMAGE_CENTER_X:.1f} px")
-print(f"- Image Width: {IMAGE_WIDTH:.1f} px")
-print(f"Publishing detections on port 5555 for LiDAR correlation")
+# Normalized [xmin, ymin, xmax, ymax] -> pixel coordinates, broadcast over all (N, 4) boxes.
+# float64 like the bbox arrays, so the multiply needs no casting and the published
+# values match the scalar math exactly
+BBOX_DTYPE = np.float64
+BBOX_PIXEL_SCALE = np.array([IMAGE_WIDTH, IMAGE_HEIGHT, IMAGE_WIDTH, IMAGE_HEIGHT], dtype=BBOX_DTYPE)
 
 # -----------------------------------------------------------------------------------------------
-# Helper function: compute bounding box area
+# Helper function: compute bounding box areas
 # -----------------------------------------------------------------------------------------------
-def compute_bbox_area(bbox):
+def compute_bbox_areas(bboxes):
     """
-    Given a bounding box [xmin_px, ymin_px, xmax_px, ymax_px],
-    compute its area in pixels².
+    Given an (N, 4) array of bounding boxes [xmin_px, ymin_px, xmax_px, ymax_px],
+    compute their areas in pixels².
     """
-    x_min, y_min, x_max, y_max = bbox
-    width = x_max - x_min
-    height = y_max - y_min
-    return width * height
+    return (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
 
 # -----------------------------------------------------------------------------------------------
 # User-defined class for callback
@@ -73,50 +105,114 @@ def compute_bbox_area(bbox):
 class user_app_callback_class(app_callback_class):
     def __init__(self):
         super().__init__()
-        # Initialize ZMQ publisher
-        self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.PUB)
-        self.socket.bind("tcp://*:5555")
+        # Initialize ZMQ; the PUB socket itself lives in the publisher thread
+        self.context = zmq.Context(io_threads=2)
+
+        # A GLib timer on the pipeline's main loop asks for one frame every PROCESS_INTERVAL;
+        # the pad probe only checks this flag, so skipped frames cost no clock read
+        self.want_frame = False
+        GLib.timeout_add(int(PROCESS_INTERVAL * 1000), self.request_frame)
+
+        # Latest raw frame (timestamp, frame, detections) handed to the publisher thread;
+        # maxlen=1 overwrites a frame the publisher has not picked up yet
+        self.pending = deque(maxlen=1)
+        self.frame_ready = threading.Event()
+
+        # One message dict and a pool of detection dicts, owned by the publisher thread and
+        # refilled in place every frame so publishing doesn't churn the allocator/GC
+        self._det_pool = [dict() for _ in range(DETECTION_POOL_SIZE)]
+        self._msg = {'timestamp': 0.0, 'frame': 0, 'detections': []}
+
+        self.running = True
+        self.publisher_thread = threading.Thread(target=self.publisher_loop, daemon=True)
+        self.publisher_thread.start()
+
+    def request_frame(self):
+        """GLib timeout handler: flag the next buffer for processing"""
+        self.want_frame = True
+        return GLib.SOURCE_CONTINUE
+
+    def publisher_loop(self):
+        """Own the PUB socket: build, encode and send detection messages off the streaming thread"""
+        socket = self.context.socket(zmq.PUB)
+        
+        # Perception data is only useful fresh: keep just the latest message per
+        # subscriber so a slow consumer can never back up into the pipeline
+        socket.setsockopt(zmq.CONFLATE, 1)  # Only keep latest message
+        socket.setsockopt(zmq.LINGER, 0)  # Don't wait when closing
+        socket.setsockopt(zmq.IMMEDIATE, 1)  # Only queue to completed connections
+        socket.setsockopt(zmq.SNDBUF, ZMQ_SOCKET_BUFFER)  # Large kernel send buffer
+        socket.setsockopt(zmq.TCP_KEEPALIVE, 1)  # Drop silently vanished subscribers
+        socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, ZMQ_KEEPALIVE_IDLE)
+        
+        socket.bind("tcp://*:5555")
         print("ZMQ publisher started on port 5555")
-        self.last_process_time = time.time()
 
-    def __del__(self):
-        # Cleanup ZMQ
-        if hasattr(self, 'socket'):
-            self.socket.close()
-        if hasattr(self, 'context'):
-            self.context.term()
+        while self.running:
+            if not self.frame_ready.wait(timeout=0.5):
+                continue
+            self.frame_ready.clear()
+            try:
+                timestamp, frame, raw_detections = self.pending.pop()
+            except IndexError:
+                continue
+
+            # Publish via ZMQ (filtered detections); the message is encoded to bytes
+            # before the next frame reuses its dicts
+            message = self._msg
+            detection_list = build_detection_list(raw_detections, self._det_pool,
+                                                  message['detections'])
+            if detection_list:  # Only publish if we have detections
+                message['timestamp'] = timestamp
+                message['frame'] = frame
+                message['detections'] = detection_list
+                try:
+                    socket.send(encode_message(message), zmq.NOBLOCK)
+                except zmq.Again:
+                    pass  # Drop the frame rather than queue stale detections
+                except Exception as e:
+                    print(f"Error publishing to ZMQ: {e}")
+
+        socket.close()
+
+    def close(self):
+        """Stop the publisher thread (it closes its LINGER=0 socket), then terminate ZMQ"""
+        self.running = False
+        self.frame_ready.set()
+        self.publisher_thread.join(timeout=1.0)
+        self.context.term()
 
 # -----------------------------------------------------------------------------------------------
-# Helper function: bounding box center -> angle for 2D LiDAR correlation
+# Helper function: bounding box centers -> angles for 2D LiDAR correlation
 # -----------------------------------------------------------------------------------------------
-def compute_detection_angle(bbox):
+def compute_detection_angles(bboxes):
     """
-    Given a bounding box [xmin_px, ymin_px, xmax_px, ymax_px] in pixel coordinates,
-    compute the horizontal center in pixels, then convert that to an angle in degrees
-    relative to the camera's optical center.
+    Given an (N, 4) array of bounding boxes [xmin_px, ymin_px, xmax_px, ymax_px] in pixel
+    coordinates, compute each horizontal center in pixels, then convert that to an angle
+    in degrees relative to the camera's optical center.
     
-    Returns angle in degrees where:
+    Returns an (N,) array of angles in degrees where:
     - Negative angles are to the left of center
     - Positive angles are to the right of center
     - Range is approximately -CAMERA_HFOV_DEG/2 to +CAMERA_HFOV_DEG/2
     """
-    x_min, y_min, x_max, y_max = bbox
-    bbox_center_x = (x_min + x_max) / 2.0
+    bbox_center_x = (bboxes[:, 0] + bboxes[:, 2]) * 0.5
 
     # Pixel offset from the optical center (-960 to +960 for 1920px width)
     offset_pixels = bbox_center_x - IMAGE_CENTER_X
     
     # Convert to angle using FOV
     # If CAMERA_HFOV_DEG is 70°, then at IMAGE_WIDTH/2 pixels offset we want ±35°
-    angle_deg = (offset_pixels / (IMAGE_WIDTH/2)) * (CAMERA_HFOV_DEG/2)
+    angle_deg = offset_pixels * PX_TO_DEG
 
-    if DEBUG_ANGLES:
-        print(f"\nAngle Calculation Debug:")
-        print(f"- Bbox X range: {x_min:.1f} to {x_max:.1f} px")
-        print(f"- Bbox center: {bbox_center_x:.1f} px")
-        print(f"- Offset from center: {offset_pixels:+.1f} px")
-        print(f"- Resulting angle: {angle_deg:+.1f}°")
+    if __debug__ and DEBUG_ANGLES:
+        for (x_min, _, x_max, _), center, offset, angle in zip(
+                bboxes.tolist(), bbox_center_x.tolist(), offset_pixels.tolist(), angle_deg.tolist()):
+            print(f"\nAngle Calculation Debug:")
+            print(f"- Bbox X range: {x_min:.1f} to {x_max:.1f} px")
+            print(f"- Bbox center: {center:.1f} px")
+            print(f"- Offset from center: {offset:+.1f} px")
+            print(f"- Resulting angle: {angle:+.1f}°")
 
     return angle_deg
 
@@ -132,95 +228,124 @@ def app_callback(pad, info, user_data):
     # Frame counter
     user_data.increment()
 
-    # Check if enough time has passed since last processing
-    current_time = time.time()
-    if current_time - user_data.last_process_time < PROCESS_INTERVAL:
+    # Only process the frame the PROCESS_INTERVAL timer asked for
+    if not user_data.want_frame:
         return Gst.PadProbeReturn.OK
 
-    user_data.last_process_time = current_time
+    user_data.want_frame = False
+    current_time = time.time()
 
     # Get detections
-    roi = hailo.get_roi_from_buffer(buffer)
-    detections = roi.get_objects_typed(hailo.HAILO_DETECTION)
+    roi = get_roi_from_buffer(buffer)
+    detections = roi.get_objects_typed(HAILO_DETECTION)
 
-    # Collection for all detections
-    detection_list = []
+    if not detections:
+        return Gst.PadProbeReturn.OK
 
+    # Copy out plain values only; all math, encoding and sending happens in the publisher thread
+    raw_detections = []
+    append = raw_detections.append
     for detection in detections:
-        label = detection.get_label()
-        confidence = detection.get_confidence()
-
-        # Hailo bounding box (likely 0..1 normalized coords)
         bbox = detection.get_bbox()
-        x_min_norm = float(bbox.xmin())
-        y_min_norm = float(bbox.ymin())
-        x_max_norm = float(bbox.xmax())
-        y_max_norm = float(bbox.ymax())
-
-        # Convert normalized coords to pixel coords
-        x_min_px = x_min_norm * IMAGE_WIDTH
-        y_min_px = y_min_norm * IMAGE_HEIGHT
-        x_max_px = x_max_norm * IMAGE_WIDTH
-        y_max_px = y_max_norm * IMAGE_HEIGHT
-
-        # Build pixel-coordinate bbox
-        bbox_coords = [x_min_px, y_min_px, x_max_px, y_max_px]
-
-        # Compute bbox area
-        bbox_area = compute_bbox_area(bbox_coords)
-
-        # Skip small detections
-        if bbox_area < MIN_BBOX_AREA:
-            continue
-
-        # Attempt to get track ID
-        track_id = 0
-        track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-        if len(track) == 1:
-            track_id = track[0].get_id()
-
-        # Compute angle in degrees (for 2D LiDAR correlation)
-        angle_deg = compute_detection_angle(bbox_coords)
-
-        # Only include detections within LiDAR's front 180° field of view
-        if angle_deg < -90 or angle_deg > 90:
-            continue
-
-        # Prepare dictionary
-        det_data = {
-            'label': label,
-            'confidence': float(confidence),
-            'angle_deg': angle_deg,    # Most important for LiDAR correlation
-            'area': bbox_area,         # Add bbox area for object size
-            'bbox': bbox_coords,       # Full data if needed
-            'bbox_norm': [x_min_norm, y_min_norm, x_max_norm, y_max_norm],
-            'track_id': track_id
-        }
+        track = detection.get_objects_typed(HAILO_UNIQUE_ID)
+        append((
+            detection.get_label(),
+            detection.get_confidence(),
+            (bbox.xmin(), bbox.ymin(), bbox.xmax(), bbox.ymax()),
+            track[0].get_id() if track else 0,
+        ))
+    user_data.pending.append((current_time, user_data.get_count(), raw_detections))
+    user_data.frame_ready.set()
+
+    return Gst.PadProbeReturn.OK
+
+# -----------------------------------------------------------------------------------------------
+# Publisher thread: raw detections -> filtered detection dicts
+# -----------------------------------------------------------------------------------------------
+def build_detection_list(raw_detections, pool=None, out=None):
+    """
+    Given (label, confidence, normalized bbox, track_id) tuples, compute pixel bboxes,
+    areas and angles for all of them at once and return the dicts of detections that are
+    large enough and inside the LiDAR's front 180°.
+    If given, dicts from `pool` are overwritten in place and `out` is cleared and refilled.
+    """
+    # Typed Cython loop when it is built; the debug prints live on the NumPy path only
+    if detection_kernel is not None and not DEBUG_ANGLES:
+        return detection_kernel.process(raw_detections, IMAGE_WIDTH, IMAGE_HEIGHT,
+                                        MIN_BBOX_AREA, PX_TO_DEG, pool, out)
+
+    # Hailo bounding boxes (0..1 normalized coords) as one (N, 4) array
+    bboxes_norm = np.array([raw[2] for raw in raw_detections], dtype=BBOX_DTYPE).reshape(-1, 4)
+
+    # Pixel coords, areas and angles for every detection in a few array ops
+    bboxes_px = bboxes_norm * BBOX_PIXEL_SCALE
+    bbox_areas = compute_bbox_areas(bboxes_px)
+    angles_deg = compute_detection_angles(bboxes_px)
+
+    # Skip small detections and keep only those within LiDAR's front 180° field of view
+    keep = np.flatnonzero((bbox_areas >= MIN_BBOX_AREA) & (np.abs(angles_deg) <= 90))
+
+    # Collection for all detections
+    detection_list = [] if out is None else out
+    detection_list.clear()
+    n_pool = 0 if pool is None else len(pool)
+    for n, i in enumerate(keep.tolist()):
+        label, confidence, _, track_id = raw_detections[i]
+        angle_deg = float(angles_deg[i])
+        bbox_area = float(bbox_areas[i])
+
+        # Prepare dictionary (same keys every frame, so a pooled dict is just overwritten)
+        det_data = pool[n] if n < n_pool else {}
+        det_data['label'] = label
+        det_data['confidence'] = float(confidence)
+        det_data['angle_deg'] = angle_deg    # Most important for LiDAR correlation
+        det_data['area'] = bbox_area         # Add bbox area for object size
+        det_data['bbox'] = bboxes_px[i].tolist()       # Full data if needed
+        det_data['bbox_norm'] = bboxes_norm[i].tolist()
+        det_data['track_id'] = track_id
         detection_list.append(det_data)
 
         # Print for debugging (only large objects in LiDAR FOV)
-        print(f"\nCamera Detection:")
-        print(f"- Label: {label}")
-        print(f"- Angle: {angle_deg:+.1f}°")
-        print(f"- Area: {bbox_area/1000:.1f}k px²")
-        print(f"- Confidence: {confidence:.2f}")
-
-    # Publish via ZMQ (filtered detections)
-    if detection_list:  # Only publish if we have detections
-        message = {
-            'timestamp': time.time(),
-            'frame': user_data.get_count(),
-            'detections': detection_list
-        }
-        try:
-            user_data.socket.send_string(json.dumps(message))
-        except Exception as e:
-            print(f"Error publishing to ZMQ: {e}")
+        if __debug__ and DEBUG_ANGLES:
+            print(f"\nCamera Detection:")
+            print(f"- Label: {label}")
+            print(f"- Angle: {angle_deg:+.1f}°")
+            print(f"- Area: {bbox_area/1000:.1f}k px²")
+            print(f"- Confidence: {confidence:.2f}")
 
-    return Gst.PadProbeReturn.OK
+    return detection_list
+
+# -----------------------------------------------------------------------------------------------
+# Pin the process and raise it to real-time scheduling
+# -----------------------------------------------------------------------------------------------
+def set_realtime_scheduling():
+    """
+    Pin to CPU_AFFINITY and switch to SCHED_FIFO so the GStreamer callback and ZMQ
+    send are not preempted mid-frame. Threads started afterwards inherit both.
+    """
+    try:
+        os.sched_setaffinity(0, CPU_AFFINITY)
+        print(f"Pinned to CPUs {sorted(CPU_AFFINITY)}")
+    except (AttributeError, OSError) as e:
+        print(f"Warning: Could not set CPU affinity: {e}")
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+        print(f"Using SCHED_FIFO priority {RT_PRIORITY}")
+    except (AttributeError, OSError) as e:
+        print(f"Warning: Could not set SCHED_FIFO (needs CAP_SYS_NICE): {e}")
 
 if __name__ == "__main__":
+    print(f"Camera Parameters:")
+    print(f"- Horizontal FOV: {CAMERA_HFOV_DEG:.1f}°")
+    print(f"- Image Center: {IMAGE_CENTER_X:.1f} px")
+    print(f"- Image Width: {IMAGE_WIDTH:.1f} px")
+    print(f"Publishing detections on port 5555 for LiDAR correlation")
+
+    # Pin and prioritize before GStreamer spawns its streaming threads
+    set_realtime_scheduling()
+
     # Instantiate callback class and detection app
-    user_data = user_app_callback_class()
-    app = GStreamerDetectionApp(app_callback, user_data)
-    app.run()
\ No newline at end of file
+    # closing() guarantees ZMQ shutdown on exit or Ctrl+C, unlike __del__
+    with contextlib.closing(user_app_callback_class()) as user_data:
+        app = GStreamerDetectionApp(app_callback, user_data)
+        app.run()
\ No newline at end of file
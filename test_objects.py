@@ -2,8 +2,7 @@
 import zmq
 import time
 import json
-import random
-import math
+import numpy as np
 
 # ZMQ publisher to send simulated object data
 context = zmq.Context()
@@ -12,56 +11,66 @@ publisher.bind("tcp://*:5557")  # Object detection data on port 5557
 
 # Object classes to simulate
 OBJECT_CLASSES = ['person', 'vehicle', 'animal', 'object']
+MAX_OBJECTS = 10  # Maximum number of objects
+
+# Simulated objects live in one structured array (one row per object, one column per field)
+OBJECT_DTYPE = np.dtype([
+    ('angle_deg', 'f4'),
+    ('distance_mm', 'f4'),
+    ('size_mm', 'f4'),
+    ('confidence', 'f4'),
+    ('cls', 'i1'),  # Index into OBJECT_CLASSES
+])
+
+rng = np.random.default_rng()
 
 # Generate random objects with random distances and angles
 def generate_objects(num_objects=3):
-    objects = []
-    
-    for _ in range(num_objects):
-        obj_class = random.choice(OBJECT_CLASSES)
-        angle = random.uniform(-85, 85)  # Front 170° field of view
-        distance = random.uniform(500, 5000)  # 0.5 to 5 meters
-        
-        obj = {
-            'class': obj_class,
-            'angle_deg': angle,
-            'distance_mm': distance,
-            'confidence': random.uniform(0.7, 1.0),
-            'size_mm': random.uniform(200, 1000)  # Size in mm
-        }
-        objects.append(obj)
-    
+    objects = np.empty(num_objects, dtype=OBJECT_DTYPE)
+    objects['cls'] = rng.integers(len(OBJECT_CLASSES), size=num_objects)
+    objects['angle_deg'] = rng.uniform(-85, 85, num_objects)  # Front 170° field of view
+    objects['distance_mm'] = rng.uniform(500, 5000, num_objects)  # 0.5 to 5 meters
+    objects['confidence'] = rng.uniform(0.7, 1.0, num_objects)
+    objects['size_mm'] = rng.uniform(200, 1000, num_objects)  # Size in mm
     return objects
 
 # Randomly generate new detections
 def get_new_detections(all_objects, prob=0.2):
-    new_detections = []
-    for obj in all_objects:
-        if random.random() < prob:
-            new_detections.append(obj)
-    return new_detections
+    return all_objects[rng.random(len(all_objects)) < prob]
 
 # Move objects to simulate motion
 def update_objects(objects):
-    for obj in objects:
-        # Randomly change angle slightly
-        obj['angle_deg'] += random.uniform(-2, 2)
-        obj['angle_deg'] = max(-85, min(85, obj['angle_deg']))  # Keep in FOV
-        
-        # Randomly change distance slightly
-        obj['distance_mm'] += random.uniform(-200, 100)
-        obj['distance_mm'] = max(500, min(5000, obj['distance_mm']))
+    n = len(objects)
+    angle = objects['angle_deg']
+    distance = objects['distance_mm']
+
+    # Randomly change every angle slightly, keeping them in FOV
+    angle += rng.uniform(-2, 2, n)
+    np.clip(angle, -85, 85, out=angle)
+
+    # Randomly change every distance slightly
+    distance += rng.uniform(-200, 100, n)
+    np.clip(distance, 500, 5000, out=distance)
     
     # Add or remove objects occasionally
-    if random.random() < 0.1:  # 10% chance to add an object
-        if len(objects) < 10:  # Maximum number of objects
-            objects.append(generate_objects(1)[0])
+    if rng.random() < 0.1 and n < MAX_OBJECTS:  # 10% chance to add an object
+        objects = np.concatenate((objects, generate_objects(1)))
     
-    if random.random() < 0.05 and objects:  # 5% chance to remove an object
-        objects.pop(random.randrange(len(objects)))
+    if rng.random() < 0.05 and len(objects):  # 5% chance to remove an object
+        objects = np.delete(objects, rng.integers(len(objects)))
         
     return objects
 
+# Rows -> JSON-ready dicts in the message layout subscribers expect
+def to_dicts(objects):
+    return [{
+        'class': OBJECT_CLASSES[cls],
+        'angle_deg': angle,
+        'distance_mm': distance,
+        'confidence': confidence,
+        'size_mm': size
+    } for angle, distance, size, confidence, cls in objects.tolist()]
+
 def main():
     print("Starting simulated object detection...")
     print("Sending data to port 5557")
@@ -81,11 +90,12 @@ def main():
             # Create message data
             data = {
                 'timestamp': time.time(),
-                'objects': objects,
-                'new_detections': new_detections
+                'objects': to_dicts(objects),
+                'new_detections': to_dicts(new_detections)
             }
             
-            # Send the data
+            # Send the data as one JSON frame: the 5557 subscribers use CONFLATE, which
+            # cannot carry multipart messages, and the correlator on this port speaks jsoncpp
             message = "OBJECT_DATA " + json.dumps(data)
             publisher.send_string(message)
             